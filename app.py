@@ -12,35 +12,49 @@ Improvements:
 5. Fixed Hyprpaper IPC socket control (proper unload/reload workflow)
 """
 
+import json
 import os
+import re
 import sys
 import subprocess
 import shutil
-import json
+import signal
+import socket
 import time
-import hashlib
 import logging
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from threading import Thread
+from threading import Lock, Thread
 
 # --- LOGGING SETUP ---
 LOG_DIR = Path.home() / ".config" / "hyprland-video-wallpapers"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
-LOG_FILE = LOG_DIR / f"gui_debug_{int(time.time())}.log"
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# One log per launch piles up files; set HVW_KEEP_LOGS=1 to keep them all
+if os.environ.get("HVW_KEEP_LOGS"):
+    LOG_FILE = LOG_DIR / f"gui_debug_{int(time.time())}.log"
+else:
+    LOG_FILE = LOG_DIR / "gui_debug.log"
+
+def _make_log_handlers():
+    """Full DEBUG log to the file, only warnings and errors on the console"""
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(LOG_FILE, mode="w")
+    file_handler.setLevel(logging.DEBUG)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.WARNING)
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+logging.basicConfig(level=logging.DEBUG, handlers=_make_log_handlers())
 logger = logging.getLogger(__name__)
 
 logger.info("=" * 80)
 logger.info("Hyprland Video Wallpapers GUI Starting")
-logger.info(f"Log file: {LOG_FILE}")
+logger.info("Log file: %s", LOG_FILE)
 logger.info("=" * 80)
 
 try:
@@ -49,10 +63,10 @@ try:
     gi.require_version('Gtk', '4.0')
     gi.require_version('Gdk', '4.0')
     logger.info("✓ GTK/GDK versions required")
-    from gi.repository import Gtk, Gdk, GdkPixbuf, GLib, Gio
+    from gi.repository import Gtk, Gdk, GLib, GObject
     logger.info("✓ GTK/GDK modules imported")
 except Exception as e:
-    logger.error(f"✗ Failed to import GTK modules: {e}", exc_info=True)
+    logger.error("✗ Failed to import GTK modules: %s", e, exc_info=True)
     sys.exit(1)
 
 try:
@@ -62,7 +76,7 @@ try:
     logger.info("✓ Adwaita available")
 except Exception as e:
     HAS_ADW = False
-    logger.warning(f"✗ Adwaita not available (non-critical): {e}")
+    logger.warning("✗ Adwaita not available (non-critical): %s", e)
 
 # --- CONSTANTS ---
 APP_ID = "org.example.hypr_video_wallpaper_gui"
@@ -73,45 +87,296 @@ HYPR_CONF = HOME / ".config" / "hypr" / "hyprland.conf"
 HYPRPAPER_CONF = HOME / ".config" / "hypr" / "hyprpaper.conf"
 RULES_DEST_DIR = CONFIG_DIR / "rules"
 RULES_DEST = RULES_DEST_DIR / "hyprland-video-wallpapers.conf"
+TOGGLEFLOAT_CONF = CONFIG_DIR / "togglefloating.conf"
+HYPR_CONF_BACKUP = HYPR_CONF.parent / "hyprland.conf.motion.bak"
+HYPRPAPER_CONF_BACKUP = HYPRPAPER_CONF.parent / "hyprpaper.conf.motion.bak"
+INSTALLER_MARKER = "Added by Hyprland Video Wallpapers Installer"
 THUMB_CACHE = HOME / ".cache" / "hvw_thumbs"
 THUMB_CACHE.mkdir(parents=True, exist_ok=True)
 
-VIDEO_EXTS = {".mp4", ".mkv", ".webm", ".mov", ".avi"}
-IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+VIDEO_EXTS = frozenset({".mp4", ".mkv", ".webm", ".mov", ".avi"})
+IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".webp"})
+SCAN_WORKERS = 8
+# A line mentioning the installer plus the source/exec-once lines right after it
+HYPR_CONF_ENTRY_RE = re.compile(
+    r"^.*hyprland-video-wallpapers.*\n?(?:[ \t]*(?:source|exec-once) =.*(?:\n|$))*", re.M)
+# BACKUP_*="..." assignments in the generated config.conf
+CONFIG_BACKUP_RE = re.compile(r'^(BACKUP_[A-Z_]+)="([^"]*)"', re.M)
+THUMB_WIDTH = 300  # Width the gallery cards display thumbnails at
+STANDARD_BIN_DIRS = ("/usr/bin", "/usr/local/bin")  # Where packaged tools live
 
 # --- UTILITIES ---
+def media_ext(path):
+    """Lower-cased extension of a path string, without building a Path"""
+    return os.path.splitext(path)[1].lower()
+
+def atomic_write_text(path, content, mode=None):
+    """Replace path's contents atomically via a temp file and os.replace
+
+    Symlinks are followed so dotfile-managed configs stay links, and the
+    existing permission bits are kept unless mode is given.
+    """
+    path = Path(os.path.realpath(path))
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            pass
+    tmp = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    try:
+        tmp.write_text(content)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def copy_file(src, dst):
+    """shutil.copy2 with the data moved in-kernel by copy_file_range
+
+    Unlike the sendfile path inside shutil.copyfile, copy_file_range lets
+    copy-on-write filesystems (btrfs, XFS) share extents instead of copying.
+    Anything the syscall rejects or leaves short falls back to shutil.copyfile.
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if not copied:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError):
+        remaining = None
+    if remaining != 0:
+        # Unsupported, failed, or stopped short: never keep a truncated copy
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 def run(cmd):
     """Execute command and return stdout, stderr"""
     try:
-        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        # Python's own fds are non-inheritable (PEP 446), so skip the
+        # close-every-fd loop and let CPython take the vfork/posix_spawn path
+        p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                           close_fds=False)
         return p.stdout, p.stderr
     except Exception as e:
         return "", str(e)
 
-def sha1(x: str) -> str:
-    """Generate SHA1 hash"""
-    return hashlib.sha1(x.encode()).hexdigest()
+def spawn_daemon(argv):
+    """Start argv detached in its own session with stdio on /dev/null
+
+    setsid happens inside CPython's C spawn code, so there is no shell,
+    nohup or setsid exec in between and no Python runs in the child.
+    """
+    subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, cwd="/", start_new_session=True)
+
+def wait_for_exit(names, timeout=0.2):
+    """Poll /proc until no process whose comm is in names remains"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        alive = False
+        with os.scandir("/proc") as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{entry.name}/comm") as f:
+                        if f.read().strip() in names:
+                            alive = True
+                            break
+                except OSError:
+                    continue
+        if not alive:
+            return True
+        time.sleep(0.01)
+    return False
+
+def kill_matching(patterns, sig=signal.SIGTERM):
+    """Signal every process whose command line contains one of patterns,
+    like a series of `pkill -f` calls but with a single /proc walk"""
+    me = os.getpid()
+    killed = 0
+    with os.scandir("/proc") as it:
+        for entry in it:
+            if not entry.name.isdigit() or int(entry.name) == me:
+                continue
+            try:
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+                if any(p in cmdline for p in patterns):
+                    os.kill(int(entry.name), sig)
+                    killed += 1
+            except OSError:
+                continue
+    return killed
+
+def wait_for_sockets(paths, timeout=10):
+    """Poll until every unix socket in paths accepts a connection"""
+    pending = set(paths)
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        for path in list(pending):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                if s.connect_ex(path) == 0:
+                    pending.discard(path)
+        if pending:
+            time.sleep(0.1)
+    return not pending
+
+_PATH_DIR_EXECS = {}
+
+def _dir_executables(d):
+    """Executables in one directory, rescanned only when its mtime changes"""
+    try:
+        mtime = os.stat(d).st_mtime_ns
+    except OSError:
+        return frozenset()
+    cached = _PATH_DIR_EXECS.get(d)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    names = set()
+    try:
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_file() and os.access(entry.path, os.X_OK):
+                    names.add(entry.name)
+    except OSError:
+        pass
+    names = frozenset(names)
+    _PATH_DIR_EXECS[d] = (mtime, names)
+    return names
+
+def hypr_ipc(request):
+    """Send one request over Hyprland's command socket and return the reply,
+    the same exchange `hyprctl` does but without spawning a process"""
+    sig = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    if not sig:
+        raise OSError("HYPRLAND_INSTANCE_SIGNATURE is not set")
+    runtime = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    for base in (os.path.join(runtime, "hypr"), "/tmp/hypr"):
+        path = os.path.join(base, sig, ".socket.sock")
+        if os.path.exists(path):
+            break
+    else:
+        raise OSError(f"Hyprland socket not found for instance {sig}")
+    chunks = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(request.encode())
+        while chunk := s.recv(65536):
+            chunks.append(chunk)
+    return b"".join(chunks).decode(errors="replace")
+
+def present_executables():
+    """Return the names of all executables on $PATH
+
+    Directory listings are cached; installing a tool bumps its directory's
+    mtime, so repeated checks only rescan what changed.
+    """
+    found = set()
+    for d in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        found |= _dir_executables(d or ".")
+    return found
+
+def missing_executables(names):
+    """Return the names not found on $PATH, checking the standard bin
+    directories directly before falling back to a full PATH listing"""
+    path_dirs = os.environ.get("PATH", os.defpath).split(os.pathsep)
+    hints = [d for d in STANDARD_BIN_DIRS if d in path_dirs]
+    missing = [n for n in names
+               if not any(os.access(os.path.join(d, n), os.X_OK) for d in hints)]
+    if missing:
+        execs = present_executables()
+        missing = [n for n in missing if n not in execs]
+    return missing
+
+def thumb_key(x: str) -> str:
+    """Generate a short filesystem-safe cache key (v2: 64-bit BLAKE2b)"""
+    import hashlib
+    return "v2_" + hashlib.blake2b(x.encode(), digest_size=8).hexdigest()
+
+def thumb_ready(path: Path) -> bool:
+    """A cached thumbnail only counts if it exists and is non-empty"""
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+_THUMB_TEXTURES = OrderedDict()
+_THUMB_TEXTURES_MAX = 256
+
+def _load_thumb_texture_async(path: str, width: int, on_ready):
+    """Decode a thumbnail off the UI path and share the texture between cards"""
+    from gi.repository import GdkPixbuf, Gio
+    key = (path, width)
+    texture = _THUMB_TEXTURES.get(key)
+    if texture is not None:
+        _THUMB_TEXTURES.move_to_end(key)
+        on_ready(texture)
+        return
+
+    def on_pixbuf(_source, result):
+        try:
+            pb = GdkPixbuf.Pixbuf.new_from_stream_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not decode thumbnail %s: %s", path, e)
+            return
+        # Upload once; every card showing this media reuses the same texture
+        texture = Gdk.Texture.new_for_pixbuf(pb)
+        _THUMB_TEXTURES[key] = texture
+        if len(_THUMB_TEXTURES) > _THUMB_TEXTURES_MAX:
+            _THUMB_TEXTURES.popitem(last=False)
+        on_ready(texture)
+
+    def on_stream(gfile, result):
+        try:
+            stream = gfile.read_finish(result)
+        except GLib.Error as e:
+            logger.warning("Could not open thumbnail %s: %s", path, e)
+            return
+        GdkPixbuf.Pixbuf.new_from_stream_at_scale_async(stream, width, -1, True, None, on_pixbuf)
+
+    # Low priority so decoding never delays input handling or redraws
+    Gio.File.new_for_path(path).read_async(GLib.PRIORITY_LOW, None, on_stream)
 
 # --- MEDIA ITEM CLASSES ---
-class MediaItem:
-    def __init__(self, path: Path):
+class MediaItem(GObject.Object):
+    def __init__(self, path: Path, ext=None, st=None):
+        super().__init__()
         self.path = path
         self.title = path.name
         self.thumb = None
         self.workspace = 0
-        self.is_video = path.suffix.lower() in VIDEO_EXTS
-        self.is_image = path.suffix.lower() in IMAGE_EXTS
+        self._st = st
+        if ext is None:
+            ext = media_ext(path.name)
+        self.is_video = ext in VIDEO_EXTS
+        self.is_image = ext in IMAGE_EXTS
+
+    def _thumb_cache_path(self):
+        """Thumbnail location; size and mtime are part of the key, so a
+        replaced or edited source never hits a stale thumbnail"""
+        st = self._st or self.path.stat()
+        return THUMB_CACHE / f"{thumb_key(f'{self.path}:{st.st_size}:{st.st_mtime_ns}')}.jpg"
 
 class VideoItem(MediaItem):
-    def __init__(self, path: Path):
-        super().__init__(path)
+    def __init__(self, path: Path, probe=True, ext=None, st=None):
+        super().__init__(path, ext, st)
         self.duration = 0.0
         self.width = 0
         self.height = 0
-        self._probe()
+        if probe:
+            self._probe()
 
     def _probe(self):
-        """Probe video metadata using ffprobe"""
+        """Probe video metadata using ffprobe (cached per size/mtime)"""
+        if self._load_cached_meta():
+            self.thumb = self.ensure_thumb()
+            return
         cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", 
                "-show_format", "-show_streams", str(self.path)]
         out, err = run(cmd)
@@ -125,67 +390,195 @@ class VideoItem(MediaItem):
                 self.width = int(v.get("width", 0))
                 self.height = int(v.get("height", 0))
             self.duration = float(data.get("format", {}).get("duration", 0))
+            self._store_cached_meta()
             self.thumb = self.ensure_thumb()
         except:
             pass
 
+    def _meta_cache(self):
+        """Return (cache file, freshness key) for this video's metadata"""
+        st = self._st or self.path.stat()
+        return THUMB_CACHE / f"{thumb_key(str(self.path))}.meta.json", [st.st_size, st.st_mtime_ns]
+
+    def _load_cached_meta(self):
+        """Load width/height/duration from the metadata cache if still fresh"""
+        try:
+            meta_path, key = self._meta_cache()
+            meta = json.loads(meta_path.read_text())
+            if meta.get("key") != key:
+                return False
+            self.width = int(meta["w"])
+            self.height = int(meta["h"])
+            self.duration = float(meta["duration"])
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _store_cached_meta(self):
+        """Persist probed metadata atomically next to the thumbnail"""
+        try:
+            meta_path, key = self._meta_cache()
+            tmp = meta_path.with_suffix(f".tmp{os.getpid()}_{id(self)}")
+            tmp.write_text(json.dumps({"key": key, "w": self.width,
+                                       "h": self.height, "duration": self.duration}))
+            os.replace(tmp, meta_path)
+        except OSError as e:
+            logger.warning("Could not cache metadata for %s: %s", self.path.name, e)
+
     def ensure_thumb(self):
         """Generate or retrieve cached thumbnail"""
-        key = sha1(str(self.path))
-        out = THUMB_CACHE / f"{key}.png"
-        if out.exists():
+        try:
+            out = self._thumb_cache_path()
+        except OSError:
+            return None
+        if thumb_ready(out):
             return out
-        cmd = ["ffmpeg", "-y", "-ss", "00:00:01", "-i", str(self.path), 
-               "-frames:v", "1", "-vf", "scale=320:-1", str(out)]
-        run(cmd)
-        return out if out.exists() else None
+        # Input-side -ss seeks straight to the nearest keyframe instead of
+        # decoding everything up to 1s, and -skip_frame nokey keeps the
+        # decoder from touching anything but that keyframe; the scan pool
+        # already parallelises. Clips shorter than 2s are sampled halfway.
+        # Try GPU decoding first and fall back to software if it fails.
+        # ffmpeg writes to a temp name that only replaces out once it holds
+        # a frame, so a failed or killed run never leaves a cached empty file
+        seek = f"{min(1.0, self.duration / 2):.3f}" if self.duration else "1"
+        tmp = out.with_name(f".{out.stem}.tmp{os.getpid()}_{id(self)}.jpg")
+        try:
+            for hwaccel in (["-hwaccel", "auto"], []):
+                cmd = ["ffmpeg", "-y", *hwaccel, "-ss", seek, "-noaccurate_seek", "-threads", "1",
+                       "-skip_frame", "nokey", "-i", str(self.path), "-frames:v", "1", "-vf", f"scale={THUMB_WIDTH}:-1",
+                       "-q:v", "3", "-an", "-sn", str(tmp)]
+                run(cmd)
+                if thumb_ready(tmp):
+                    os.replace(tmp, out)
+                    return out
+        finally:
+            tmp.unlink(missing_ok=True)
+        return None
 
 class ImageItem(MediaItem):
-    def __init__(self, path: Path):
-        super().__init__(path)
+    def __init__(self, path: Path, probe=True, ext=None, st=None):
+        super().__init__(path, ext, st)
         self.width = 0
         self.height = 0
-        self._probe()
+        if probe:
+            self._probe()
 
     def _probe(self):
-        """Get image dimensions"""
+        """Get image dimensions and a cached downscaled thumbnail"""
+        from gi.repository import GdkPixbuf
         try:
-            pb = GdkPixbuf.Pixbuf.new_from_file(str(self.path))
-            self.width = pb.get_width()
-            self.height = pb.get_height()
-            self.thumb = self.path  # Images are their own thumbnails
+            # get_file_info only parses the header, no full decode
+            _fmt, self.width, self.height = GdkPixbuf.Pixbuf.get_file_info(str(self.path))
+            self.thumb = self.ensure_thumb()
         except:
             pass
 
+    def ensure_thumb(self):
+        """Generate or retrieve cached thumbnail"""
+        from gi.repository import GdkPixbuf
+        out = self._thumb_cache_path()
+        if thumb_ready(out):
+            return out
+        try:
+            pb = GdkPixbuf.Pixbuf.new_from_file_at_scale(str(self.path), THUMB_WIDTH, -1, True)
+            tmp = out.with_suffix(f".tmp{os.getpid()}_{id(self)}")
+            pb.savev(str(tmp), "jpeg", ["quality"], ["85"])
+            os.replace(tmp, out)
+            return out
+        except (GLib.Error, OSError) as e:
+            logger.warning("Could not create thumbnail for %s: %s", self.path.name, e)
+            # Fall back to decoding the source image in the gallery
+            return self.path
+
 # --- MEDIA SCANNER ---
 class MediaScanner:
     def __init__(self, directory: Path, backend_types):
         self.dir = directory
         self.backend_types = backend_types
 
-    def scan(self):
-        """Scan directory for media files based on backend types"""
+    def scan(self, progress=None, on_item=None, cancelled=None):
+        """Scan directory for media files based on backend types
+
+        progress, if given, is called as progress(done, total) from the
+        scanning thread each time an item finishes probing. on_item, if
+        given, is called as on_item(item) from the scanning thread as soon
+        as an item is ready to show. cancelled, if given, is polled between
+        items; once it returns True no further probes are started.
+        """
         if not self.dir.exists():
             return []
         
+        wanted = frozenset()
+        if "mpv" in self.backend_types:
+            wanted |= VIDEO_EXTS
+        if "hyprpaper" in self.backend_types:
+            wanted |= IMAGE_EXTS
+
+        # Filter on the name first so unrelated files cost nothing; the
+        # is_file() check is served from the readdir data, and only the
+        # matching entries are ever turned into Path objects.
+        entries = []
+        with os.scandir(self.dir) as it:
+            for e in it:
+                ext = media_ext(e.name)
+                if ext in wanted and e.is_file(follow_symlinks=False):
+                    entries.append((e.name, ext, e))
+        entries.sort(key=lambda t: t[0])
+
         media_items = []
-        for p in sorted(self.dir.iterdir()):
-            if not p.is_file():
-                continue
-            
-            ext = p.suffix.lower()
-            if "mpv" in self.backend_types and ext in VIDEO_EXTS:
-                media_items.append(VideoItem(p))
-            elif "hyprpaper" in self.backend_types and ext in IMAGE_EXTS:
-                media_items.append(ImageItem(p))
-        
+        pending = []
+        for _name, ext, entry in entries:
+            if ext in VIDEO_EXTS:
+                item = VideoItem(Path(entry.path), probe=False, ext=ext, st=entry.stat())
+                # Videos with cached metadata and a thumbnail on disk are
+                # served right here; anything that still needs ffprobe or
+                # ffmpeg goes to the pool (_probe reuses the cached metadata)
+                thumb = None
+                if item._load_cached_meta():
+                    try:
+                        thumb = item._thumb_cache_path()
+                    except OSError:
+                        pass
+                if thumb is not None and thumb_ready(thumb):
+                    item.thumb = thumb
+                    if on_item:
+                        on_item(item)
+                else:
+                    pending.append(item)
+            else:
+                item = ImageItem(Path(entry.path), probe=False, ext=ext, st=entry.stat())
+                pending.append(item)
+            media_items.append(item)
+
+        if pending:
+            # Probing spawns ffprobe/ffmpeg per item, so fan it out to a pool
+            workers = min(os.cpu_count() or 1, SCAN_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(m._probe): m for m in pending}
+                for done, future in enumerate(as_completed(futures), 1):
+                    if cancelled and cancelled():
+                        # Drop the queued probes; only running ones finish
+                        for f in futures:
+                            f.cancel()
+                        break
+                    future.result()
+                    if on_item:
+                        on_item(futures[future])
+                    if progress:
+                        progress(done, len(futures))
+
         return media_items
 
+def media_sort_key(item):
+    """Gallery order: videos before images, each sorted by path"""
+    return (not item.is_video, str(item.path))
+
 # --- UI COMPONENTS ---
 class ThumbnailCard(Gtk.Box):
-    def __init__(self, media: MediaItem, on_preview):
+    """Recyclable gallery cell; the GridView factory binds a MediaItem to it"""
+    def __init__(self, on_preview):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=4)
-        self.media = media
+        self.media = None
         self.on_preview = on_preview
 
         self.set_margin_top(6)
@@ -195,34 +588,57 @@ class ThumbnailCard(Gtk.Box):
 
         # Thumbnail
         img_box = Gtk.Box()
-        img = Gtk.Image()
-        if media.thumb and media.thumb.exists():
-            pb = GdkPixbuf.Pixbuf.new_from_file_at_scale(str(media.thumb), 300, -1, True)
-            img.set_from_pixbuf(pb)
-        else:
-            icon_name = "video-x-generic-symbolic" if media.is_video else "image-x-generic-symbolic"
-            img.set_from_icon_name(icon_name)
-        img.set_pixel_size(200)
-        ctx = img.get_style_context()
+        self.img = Gtk.Picture()
+        self.img.set_content_fit(Gtk.ContentFit.SCALE_DOWN)
+        self.img.set_size_request(200, 200)
+        ctx = self.img.get_style_context()
         ctx.add_class("thumbnail")
-        img_box.append(img)
+        img_box.append(self.img)
         self.append(img_box)
 
-        dim_text = f"{media.width}x{media.height}" if hasattr(media, 'width') else ""
-        media_type = "🎥 Video" if media.is_video else "🖼️ Image"
-        label = Gtk.Label(label=f"{media.title}\n{dim_text}\n{media_type}")
-        label.set_wrap(True)
-        label.set_justify(Gtk.Justification.CENTER)
-        self.append(label)
+        self.label = Gtk.Label()
+        self.label.set_wrap(True)
+        self.label.set_justify(Gtk.Justification.CENTER)
+        self.append(self.label)
 
         h = Gtk.Box(spacing=6, homogeneous=True)
         b_prev = Gtk.Button(label="Preview")
-        b_prev.connect("clicked", lambda *_: self.on_preview(media))
+        b_prev.connect("clicked", lambda *_: self.media and self.on_preview(self.media))
         h.append(b_prev)
 
         self.append(h)
         self.add_css_class("thumbnail-card")
 
+    def bind(self, media: MediaItem):
+        """Show media in this (possibly recycled) card"""
+        self.media = media
+
+        # Show the type icon as a placeholder until the thumbnail is decoded
+        icon_name = "video-x-generic-symbolic" if media.is_video else "image-x-generic-symbolic"
+        icon_theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
+        self.img.set_paintable(icon_theme.lookup_icon(icon_name, None, 200, 1,
+                                                      Gtk.TextDirection.NONE, 0))
+        if media.thumb and media.thumb.exists():
+            card_ref = weakref.ref(self)
+
+            def on_ready(texture):
+                # The card may have been destroyed or rebound to other media
+                # before decoding finished
+                card = card_ref()
+                if card is not None and card.media is media:
+                    card.img.set_paintable(texture)
+
+            _load_thumb_texture_async(str(media.thumb), THUMB_WIDTH, on_ready)
+
+        dim_text = f"{media.width}x{media.height}" if hasattr(media, 'width') else ""
+        media_type = "🎥 Video" if media.is_video else "🖼️ Image"
+        self.label.set_text(f"{media.title}\n{dim_text}\n{media_type}")
+
+    def unbind(self):
+        """Drop the texture when the card scrolls out of view and is recycled"""
+        self.media = None
+        self.img.set_paintable(None)
+
 # --- NAVIGATION UTILITY ---
 def _wrap_with_nav_bar(title, content, pop_func, next_action_func=None, next_label="Next"):
     """Wraps a page content with an Adw.HeaderBar and navigation buttons."""
@@ -254,1463 +670,1812 @@ def _wrap_with_nav_bar(title, content, pop_func, next_action_func=None, next_lab
     else:
         return content
 
-# --- MAIN WINDOW ---
-class MainWindow(Gtk.ApplicationWindow if not HAS_ADW else Adw.ApplicationWindow):
-    def __init__(self, app):
-        logger.info("MainWindow.__init__ called")
-        try:
-            super().__init__(application=app)
-            logger.info("✓ ApplicationWindow initialized")
-            self.set_title("Hyprland Video Wallpapers Installer")
-            self.set_default_size(1200, 800)
-            
-            # Set window as floating
-            self.set_decorated(True)
-            
-            logger.info("✓ Window title and size set")
-            
-            self.ws_to_media = {}
-            self.selected_workspaces = set()
-            self.backend_types = ["mpv"]
-            self.backup_conf_path = None
-            self.hyprpaper_backup_path = None
-
-            if HAS_ADW:
-                try:
-                    Adw.StyleManager.get_default().set_color_scheme(1)
-                    logger.info("✓ Adwaita dark mode set")
-                except Exception as e:
-                    logger.warning(f"Could not set Adwaita theme: {e}")
+# --- HELPER SCRIPT ---
+# Written verbatim to HELPER_SCRIPT; all per-install settings live in
+# config.conf, which the script sources, so this is a plain constant
+HELPER_SCRIPT_CONTENT = '''#!/bin/bash
+set -euo pipefail
+# A write to an mpv connection whose socat has exited must fail with EPIPE,
+# not kill the whole helper before its cleanup trap can run
+trap '' PIPE
 
-            self.stack = Gtk.Stack()
-            self.set_content(self.stack)
-            logger.info("✓ Stack created and set as content")
-            
-            self.video_dir = None
-            self.image_dir = None
+CONFIG_FILE="${HOME}/.config/hyprland-video-wallpapers/config.conf"
+if [ ! -f "$CONFIG_FILE" ]; then
+    echo "Error: Configuration file not found at $CONFIG_FILE" >&2
+    exit 1
+fi
+source "$CONFIG_FILE"
 
-            self.media_items = []
-            self.num_workspaces = 5
-            self.gap_size = 15
-            self.top_gap = 30
-            self.original_hypr_conf = ""
+MPV_WINDOW_CLASS="mpv-workspace-video"
+MPV_BASE_SOCKET="/tmp/mpv-ws"
+HYPRPAPER_RUNNING=false
 
-            self.page_refs = {}
-            self.ws_spin = None
-            
-            logger.info("Creating pages...")
-            self._create_pages()
-            logger.info("✓ Pages created")
-            
-            self._push_page("Welcome", self.welcome_page)
-            logger.info("✓ Welcome page pushed")
-            
-        except Exception as e:
-            logger.error(f"Error in MainWindow.__init__: {e}", exc_info=True)
-            raise
+get_socket_path() {
+    echo "${MPV_BASE_SOCKET}-$1-ipc"
+}
 
-    def _create_pages(self):
-        """Create all UI pages"""
-        logger.info("Creating static pages...")
-        self.welcome_page = self._page_welcome()
-        logger.info("✓ Welcome page created")
-        self.prereq_page = self._page_prereq()
-        logger.info("✓ Prereq page created")
-        self.video_source_page = self._page_video_source()
-        logger.info("✓ Video source page created")
-        self.custom_settings_page = self._page_custom_settings()
-        logger.info("✓ Custom settings page created")
-        self.uninstall_page = self._page_uninstall()
-        logger.info("✓ Uninstall page created")
-        
-        self.gallery_page = Gtk.Box()
-        self.review_page = Gtk.Box()
-        self.apply_page = Gtk.Box()
-        self.summary_page = Gtk.Box()
-        self.uninstall_progress_page = Gtk.Box()
-        logger.info("✓ Dynamic page placeholders created")
+get_window_title() {
+    echo "${MPV_WINDOW_CLASS}-$1"
+}
 
-    def _push_page(self, title, page_content):
-        """Push page to navigation stack"""
-        next_actions = {
-            "Prerequisites": (self.prereq_to_source, "Next"),
-            "Video Source": (self._proceed_to_settings, "Next"),
-            "Custom Settings": (self._load_gallery, "Select Media"),
-            "Gallery": (self._build_review, "Continue to Review"),
-            "Review": (self._run_install_setup, "Apply Installation"),
-        }
-        
-        next_action_func, next_label = next_actions.get(title, (None, None))
-        
-        content_to_push = page_content
-        if HAS_ADW and title not in ["Welcome", "Summary", "Installing", "Uninstalling", "Uninstall"]:
-            content_to_push = _wrap_with_nav_bar(
-                title, 
-                page_content, 
-                self._pop_page, 
-                next_action_func=next_action_func,
-                next_label=next_label
-            )
-        
-        page_name = title.lower().replace(" ", "-")
+# Cached monitor state: one hyprctl call, parsed in bash, fills everything the
+# tiling and mpv code needs (every monitor's size, plus the focused one's
+# size and active workspace). Queried at startup and when monitors are
+# added/removed; the event loop keeps the focus state current from
+# workspace and focusedmon events, so no other event ever queries
+SCREEN_WIDTH=0
+SCREEN_HEIGHT=0
+FOCUSED_WS=""
+declare -A MONITOR_SIZES
+
+# Parses the plain-text reply, where each monitor block reads
+#   Monitor NAME (ID n):
+#       WIDTHxHEIGHT@RATE at XxY
+#       active workspace: ID (NAME)
+#       focused: yes|no
+# so no jq process is needed
+refresh_monitors() {
+    local key rest name="" width=0 height=0 ws=""
+    MONITOR_SIZES=()
+    while read -r key rest; do
+        case "$key" in
+            Monitor)
+                name=${rest%% *}
+                ;;
+            active)
+                if [[ "$rest" =~ ^workspace:\ ([0-9-]+) ]]; then
+                    ws=${BASH_REMATCH[1]}
+                fi
+                ;;
+            focused:)
+                if [[ "$rest" == yes ]]; then
+                    SCREEN_WIDTH=$width
+                    SCREEN_HEIGHT=$height
+                    FOCUSED_WS=$ws
+                fi
+                ;;
+            *)
+                if [[ "$key" =~ ^([0-9]+)x([0-9]+)@ ]]; then
+                    width=${BASH_REMATCH[1]}
+                    height=${BASH_REMATCH[2]}
+                    MONITOR_SIZES[$name]="$width $height"
+                fi
+                ;;
+        esac
+    done < <(hyprctl monitors 2>/dev/null)
+}
 
-        if not self.stack.get_child_by_name(page_name):
-            self.stack.add_titled(content_to_push, page_name, title)
-            
-        self.stack.set_visible_child_name(page_name)
-        self.page_refs[title] = page_content
+# One persistent socat per mpv socket: commands become plain writes to its
+# stdin instead of a fork + connect per command. Replies are read and dropped
+# so mpv never blocks on a full socket buffer.
+declare -A MPV_FDS
+declare -A MPV_PIDS
 
-    def _pop_page(self):
-        """Pop page from navigation stack"""
-        current_name = self.stack.get_visible_child_name()
+open_mpv_connection() {
+    local workspace_id="$1"
+    local socket_path="${MPV_BASE_SOCKET}-${workspace_id}-ipc"
+    local fd
+    
+    [ -S "$socket_path" ] || return 1
+    exec {fd}> >(exec socat - UNIX-CONNECT:"$socket_path" > /dev/null 2>&1)
+    MPV_FDS[$workspace_id]=$fd
+    MPV_PIDS[$workspace_id]=$!
+}
 
-        flow = {
-            "prerequisites": "welcome",
-            "video-source": "prerequisites" if self.stack.get_child_by_name("prerequisites") else "welcome",
-            "custom-settings": "video-source",
-            "gallery": "custom-settings",
-            "review": "gallery",
-            "installing": "review",
-            "summary": "installing",
-            "uninstall": "welcome"
-        }
-        
-        if current_name in flow:
-            previous_name = flow[current_name]
-            
-            # Clear directory selections when going back from video-source
-            if current_name == "video-source":
-                self.video_dir = None
-                self.image_dir = None
-                self.video_dir_label.set_text("No directory selected")
-                self.image_dir_label.set_text("No directory selected")
-            
-            # Clear selections when going back from custom-settings to video-source
-            elif current_name == "custom-settings":
-                self.selected_workspaces.clear()
-                self.num_workspaces = 5
-                self.gap_size = 15
-                self.top_gap = 30
-            
-            # Clear media selections when going back from gallery to custom-settings
-            elif current_name == "gallery":
-                self.ws_to_media.clear()
-            
-            # Navigate to previous page
-            if previous_name == "gallery":
-                self._load_gallery(is_back_navigation=True)
-            elif previous_name == "review":
-                self._build_review(is_back_navigation=True)
-            elif previous_name == "custom-settings":
-                # Recreate custom settings page to reset checkboxes
-                self.custom_settings_page = self._page_custom_settings()
-                self._push_page("Custom Settings", self.custom_settings_page)
-            elif previous_name == "video-source":
-                self._push_page("Video Source", self.video_source_page)
-            elif self.stack.get_child_by_name(previous_name):
-                self.stack.set_visible_child_name(previous_name)
+send_mpv_command() {
+    local workspace_id="$1"
+    local command_json="$2"
+    local fd="${MPV_FDS[$workspace_id]:-}"
     
-    def prereq_to_source(self):
-        """Transition from prereq to source"""
-        self.video_source_info_label.set_text("Choose a folder containing your wallpapers\n(Videos: MP4, MKV, WebM, MOV, AVI | Images: PNG, JPG, BMP, WebP)")
-        self._push_page("Video Source", self.video_source_page)
+    # (Re)connect if there is no connection yet or its socat has exited
+    if [[ -n "$fd" ]] && ! kill -0 "${MPV_PIDS[$workspace_id]}" 2>/dev/null; then
+        exec {fd}>&-
+        unset "MPV_FDS[$workspace_id]" "MPV_PIDS[$workspace_id]"
+        fd=""
+    fi
+    if [[ -z "$fd" ]]; then
+        open_mpv_connection "$workspace_id" || return 0
+        fd="${MPV_FDS[$workspace_id]}"
+    fi
+    
+    if ! printf '%s\\n' "$command_json" >&"$fd" 2>/dev/null; then
+        # socat is gone (refused connect or died since the check above);
+        # drop the connection so the next command reconnects
+        exec {fd}>&-
+        unset "MPV_FDS[$workspace_id]" "MPV_PIDS[$workspace_id]"
+    fi
+}
 
-    # --- PAGE BUILDERS ---
-    def _page_welcome(self):
-        # Kill old processes and clear sockets
-        try:
-            # Stop old MPV wallpaper processes
-            subprocess.run(["pkill", "-f", "mpv"], 
-                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)  # Wait for processes to die
-            # Stop old hyprpaper wallpaper processes
-            subprocess.run(["pkill", "-f", "hyprpaper"], 
-                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)  # Wait for processes to die
-            # Stop old instances of the script
-            subprocess.run(["pkill", "-f", ".local/bin/hyprland-video-wallpapers.sh"], 
-                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)  # Wait for processes to die
-        
-            # Now clean up the socket files
-            for socket_file in Path("/tmp").glob("mpv-ws*"):
-                socket_file.unlink()
-            logger.info("Cleared old MPV processes and sockets")
-        except Exception as e:
-            logger.warning(f"Could not clear MPV processes/sockets: {e}")
+create_blank_image() {
+    # Create a small black PNG to use as blank wallpaper
+    BLANK_IMAGE="/tmp/hyprpaper_blank.png"
+    
+    if [ ! -f "$BLANK_IMAGE" ]; then
+        # Write a 1x1 black PNG directly (signature + IHDR, IDAT, IEND)
+        local png='\\x89\\x50\\x4e\\x47\\x0d\\x0a\\x1a\\x0a\\x00\\x00\\x00\\x0d\\x49\\x48\\x44\\x52\\x00\\x00\\x00\\x01\\x00\\x00\\x00\\x01\\x08\\x02\\x00\\x00\\x00\\x90\\x77\\x53\\xde'
+        png+='\\x00\\x00\\x00\\x0c\\x49\\x44\\x41\\x54\\x78\\xda\\x63\\x60\\x60\\x60\\x00\\x00\\x00\\x04\\x00\\x01\\xc8\\xea\\xeb\\xf9'
+        png+='\\x00\\x00\\x00\\x00\\x49\\x45\\x4e\\x44\\xae\\x42\\x60\\x82'
+        printf "$png" > "$BLANK_IMAGE"
+        echo "Created blank wallpaper: $BLANK_IMAGE"
+    fi
+}
 
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
-        box.set_margin_top(40)
-        box.set_margin_bottom(40)
-        box.set_margin_start(40)
-        box.set_margin_end(40)
-        box.set_halign(Gtk.Align.CENTER)
-        box.set_valign(Gtk.Align.CENTER)
-
-        title = Gtk.Label(label="Hyprland Video Wallpapers")
-        title.add_css_class("title-1")
-        box.append(title)
-
-        subtitle = Gtk.Label(label="Transform your desktop with dynamic video and image wallpapers")
-        subtitle.add_css_class("subtitle")
-        box.append(subtitle)
+# Hyprpaper control functions
+ensure_hyprpaper() {
+    if ! pgrep -x hyprpaper > /dev/null; then
+        hyprpaper &
+        sleep 1
+        HYPRPAPER_RUNNING=true
+    else
+        echo "Hyprpaper already running"
+    fi
+}
 
-        button_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        button_box.set_halign(Gtk.Align.CENTER)
+manage_togglefloating() {
+    local workspace_id="$1"
+    local has_video=false
+    
+    # Check if this workspace has a video wallpaper
+    if [[ -v VIDEO_MAP[$workspace_id] ]]; then
+        has_video=true
+    fi
+    
+    local togglefloat_conf="${HOME}/.config/hyprland-video-wallpapers/togglefloating.conf"
+    local togglefloat_binds="${HOME}/.config/hyprland-video-wallpapers/togglefloating_binds.txt"
+    
+    if [ "$has_video" = true ]; then
+        # Disable togglefloating for video workspace
+        echo "# Togglefloating disabled on video workspace $workspace_id" > "$togglefloat_conf"
+        echo "Disabled togglefloating on video workspace $workspace_id"
+    else
+        # Enable togglefloating for non-video workspace
+        if [ -f "$togglefloat_binds" ]; then
+            {
+                echo "# Togglefloating enabled on non-video workspace $workspace_id"
+                cat "$togglefloat_binds"
+            } > "$togglefloat_conf"
+            echo "Enabled togglefloating on non-video workspace $workspace_id"
+        fi
+    fi
+}
 
-        b_install = Gtk.Button(label="Install / Configure")
-        b_install.add_css_class("suggested-action")
-        b_install.set_size_request(200, 40)
-        b_install.connect("clicked", lambda *_: self._start_install())
-        button_box.append(b_install)
+set_hyprpaper_wallpaper() {
+    local workspace_id="$1"
+    local image_path="$2"
+    
+    ensure_hyprpaper
+    
+    # Preload the specific image
+    hyprctl hyprpaper preload "$image_path" 2>/dev/null || true
+    sleep 0.3
+    
+    # An empty monitor name sets the wallpaper on every monitor in one request
+    hyprctl hyprpaper wallpaper ",$image_path" 2>/dev/null || true
+    echo "Setting wallpaper on all monitors: $image_path"
+}
 
-        b_uninstall = Gtk.Button(label="Manage / Uninstall")
-        b_uninstall.set_size_request(200, 40)
-        b_uninstall.connect("clicked", lambda *_: self._push_page("Uninstall", self.uninstall_page))
-        button_box.append(b_uninstall)
+unload_all_images() {
+    # Set blank wallpaper to clear images behind videos
+    if pgrep -x hyprpaper > /dev/null; then
+        echo "Setting blank wallpaper..."
+        
+        # Ensure blank image exists
+        if [ -f "$BLANK_IMAGE" ]; then
+            # Preload blank image
+            hyprctl hyprpaper preload "$BLANK_IMAGE" 2>/dev/null || true
+            sleep 0.1
+            
+            # Set blank on every monitor
+            hyprctl hyprpaper wallpaper ",$BLANK_IMAGE" 2>/dev/null || true
+            
+            # Now unload all the actual image wallpapers (but keep blank loaded);
+            # with blank shown everywhere they are all unused, so one request does it
+            hyprctl hyprpaper unload unused 2>/dev/null || true
+        fi
+    fi
+}
 
-        box.append(button_box)
-        return box
+clear_hyprpaper_wallpaper() {
+    # When leaving an image workspace, we need to clear the wallpaper
+    # Hyprpaper doesn't have a "clear" command, so we use a dummy approach:
+    # We'll set it to the first available wallpaper or unload all
+    if pgrep -x hyprpaper > /dev/null; then
+        # Unload all wallpapers to clear them from display
+        hyprctl hyprpaper unload all 2>/dev/null || true
+    fi
+}
 
-    def _page_prereq(self):
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
-        box.set_margin_start(20)
-        box.set_margin_end(20)
+start_all_mpv() {
+    echo "Starting MPV instances for all defined workspaces..."
 
-        title = Gtk.Label(label="Checking Prerequisites")
-        title.add_css_class("title-2")
-        box.append(title)
+    for ws_id in "${!VIDEO_MAP[@]}"; do
+        local video_path="${VIDEO_MAP[$ws_id]}"
+        local window_title=$(get_window_title "$ws_id")
+        local socket_path=$(get_socket_path "$ws_id")
         
-        info = Gtk.Label(label="One or more required tools are missing. Please install them to continue.")
-        info.add_css_class("subtitle")
-        box.append(info)
+        rm -f "$socket_path"
 
-        tools = ["ffmpeg", "ffprobe", "mpv", "socat", "jq", "hyprctl", "hyprpaper"]
-        grid = Gtk.Grid(column_spacing=12, row_spacing=6)
-        grid.set_halign(Gtk.Align.START)
+        mpv \\
+            --no-osc --no-stop-screensaver \\
+            --input-ipc-server="$socket_path" \\
+            --loop --video-sync=display-resample \\
+            --title="$window_title" \\
+            --geometry="${SCREEN_WIDTH}x${SCREEN_HEIGHT}+0+0" \\
+            "$video_path" &
         
-        for i, t in enumerate(tools):
-            found = shutil.which(t) is not None
-            g_lbl = Gtk.Label(label=t)
-            g_lbl.set_halign(Gtk.Align.START)
-            status_text = "✓ Found" if found else "✗ Missing"
-            g_status = Gtk.Label(label=status_text)
-            g_status.add_css_class("status-" + ("found" if found else "missing"))
-            g_status.set_halign(Gtk.Align.START)
-            grid.attach(g_lbl, 0, i, 1, 1)
-            grid.attach(g_status, 1, i, 1, 1)
-
-        box.append(grid)
+        sleep 2.0
         
-        return box
+        hyprctl dispatch movetoworkspace "$ws_id,title:$window_title" > /dev/null 2>&1
+        sleep 0.5
+        
+        hyprctl dispatch focuswindow "title:$window_title" > /dev/null 2>&1
+        hyprctl dispatch layoutmsg "focusmaster master" > /dev/null 2>&1
+        hyprctl dispatch splitratio exact 1.0 > /dev/null 2>&1
+        
+        echo "  ↳ Started video for Workspace $ws_id"
+        send_mpv_command "$ws_id" '{"command":["set_property","pause",true]}'
+    done
+}
 
-    def _page_video_source(self):
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
-        box.set_margin_start(20)
-        box.set_margin_end(20)
+# Initialize Hyprpaper wallpapers
+init_hyprpaper_wallpapers() {
+    if [ ${#IMAGE_MAP[@]} -gt 0 ]; then
+        echo "Initializing Hyprpaper wallpapers..."
+        ensure_hyprpaper
+        
+        # Note: We preload images on-demand now to avoid conflicts with video workspaces
+        echo "Hyprpaper ready for dynamic image switching"
+    fi
+}
 
-        title = Gtk.Label(label="Select Media Directories")
-        title.add_css_class("title-2")
-        box.append(title)
+# Queue an exact resize + move for one window: queue_place ADDR W H X Y
+queue_place() {
+    TILE_BATCH+="dispatch resizewindowpixel exact $2 $3,address:$1 ; dispatch movewindowpixel exact $4 $5,address:$1 ; "
+}
 
-        # Video directory section
-        video_section = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        video_title = Gtk.Label(label="Video Directory (for MPV backend)")
-        video_title.add_css_class("title-3")
-        video_title.set_halign(Gtk.Align.START)
-        video_section.append(video_title)
+# Send everything queued by queue_place in one hyprctl --batch round-trip
+flush_tile_batch() {
+    if [[ -n "$TILE_BATCH" ]]; then
+        hyprctl --batch "$TILE_BATCH" > /dev/null 2>&1 || true
+    fi
+    TILE_BATCH=""
+}
 
-        video_info = Gtk.Label(label="⚠️ Note: workspaces with video wallpapers will apply 'master' layout rules and disable 'togglefloating' keybind (this does not apply to workspaces with image wallpapers)")
-        video_info.add_css_class("warning")
-        video_info.set_wrap(True)
-        video_info.set_halign(Gtk.Align.START)
-        video_section.append(video_info)
+pseudo_tile_workspace() {
+    local ws_id="$1"
+    
+    local win_array=()
+    while IFS= read -r addr; do
+        [[ -n "$addr" ]] && win_array+=("$addr")
+    done < <(hyprctl clients -j | jq -r ".[] | select(.workspace.id == $ws_id and .floating == true and (.title | test(\\"^mpv-workspace-video\\") | not)) | .address")
+    
+    local win_count=${#win_array[@]}
+    [[ $win_count -eq 0 ]] && return
+    
+    local usable_width=$((SCREEN_WIDTH - GAP_SIZE * 2))
+    local usable_height=$((SCREEN_HEIGHT - TOP_GAP - GAP_SIZE * 2))
+    local start_y=$((GAP_SIZE + TOP_GAP))
+    
+    # All resizes/moves are queued and sent in one hyprctl --batch round-trip
+    TILE_BATCH=""
+    
+    case $win_count in
+        1)
+            queue_place "${win_array[0]}" $usable_width $usable_height $GAP_SIZE $start_y
+            ;;
+        2)
+            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
+            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
+            queue_place "${win_array[0]}" $half_width $usable_height $GAP_SIZE $start_y
+            queue_place "${win_array[1]}" $half_width $usable_height $half_width_gap $start_y
+            ;;
+        3)
+            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
+            local half_height=$(( (usable_height - GAP_SIZE) / 2 ))
+            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
+            local half_height_gap=$((start_y + half_height + GAP_SIZE))
+            
+            queue_place "${win_array[0]}" $half_width $usable_height $GAP_SIZE $start_y
+            queue_place "${win_array[1]}" $half_width $half_height $half_width_gap $start_y
+            queue_place "${win_array[2]}" $half_width $half_height $half_width_gap $half_height_gap
+            ;;
+        4)
+            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
+            local half_height=$(( (usable_height - GAP_SIZE) / 2 ))
+            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
+            local half_height_gap=$((start_y + half_height + GAP_SIZE))
+            
+            queue_place "${win_array[0]}" $half_width $half_height $GAP_SIZE $start_y
+            queue_place "${win_array[1]}" $half_width $half_height $half_width_gap $start_y
+            queue_place "${win_array[2]}" $half_width $half_height $GAP_SIZE $half_height_gap
+            queue_place "${win_array[3]}" $half_width $half_height $half_width_gap $half_height_gap
+            ;;
+        *)
+            local cols=3
+            local rows=$(( (win_count + cols - 1) / cols ))
+            local win_width=$(( (usable_width - GAP_SIZE * (cols - 1)) / cols ))
+            local win_height=$(( (usable_height - GAP_SIZE * (rows - 1)) / rows ))
+            
+            for i in "${!win_array[@]}"; do
+                local col=$((i % cols))
+                local row=$((i / cols))
+                local x=$((GAP_SIZE + col * (win_width + GAP_SIZE)))
+                local y=$((start_y + row * (win_height + GAP_SIZE)))
+                
+                queue_place "${win_array[$i]}" $win_width $win_height $x $y
+            done
+            ;;
+    esac
+    
+    flush_tile_batch
+}
 
-        b_choose_video = Gtk.Button(label="Choose Video Folder")
-        b_choose_video.add_css_class("suggested-action")
-        b_choose_video.set_size_request(200, 40)
-        b_choose_video.connect("clicked", lambda *_: self._choose_video_dir())
-        video_section.append(b_choose_video)
+HYPRLAND_INSTANCE_SIGNATURE="$HYPRLAND_INSTANCE_SIGNATURE"
+if [ -z "$HYPRLAND_INSTANCE_SIGNATURE" ]; then
+    HYPRLAND_INSTANCE_SIGNATURE=$(hyprctl instance -j 2>&1 | jq -r '.instanceSignature' 2>/dev/null || echo "")
+fi
 
-        self.video_dir_label = Gtk.Label(label="No directory selected")
-        self.video_dir_label.add_css_class("dim-label")
-        video_section.append(self.video_dir_label)
+SEARCH_PATHS=("/tmp/hypr/" "$XDG_RUNTIME_DIR/hypr/")
+ACTUAL_SOCKET_PATH=""
+for PATH_TO_SEARCH in "${SEARCH_PATHS[@]}"; do
+    if [ -d "$PATH_TO_SEARCH" ]; then
+        FOUND_PATH=$(find "$PATH_TO_SEARCH" -type s -name ".socket2*" 2>/dev/null | head -n 1)
+        if [ -S "$FOUND_PATH" ]; then
+            ACTUAL_SOCKET_PATH="$FOUND_PATH"
+            break
+        fi
+    fi
+done
 
-        box.append(video_section)
-
-        # Image directory section
-        image_section = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        image_section.set_margin_top(20)
-
-        image_title = Gtk.Label(label="Image Directory (for Hyprpaper backend)")
-        image_title.add_css_class("title-3")
-        image_title.set_halign(Gtk.Align.START)
-        image_section.append(image_title)
-
-        b_choose_image = Gtk.Button(label="Choose Image Folder")
-        b_choose_image.add_css_class("suggested-action")
-        b_choose_image.set_size_request(200, 40)
-        b_choose_image.connect("clicked", lambda *_: self._choose_image_dir())
-        image_section.append(b_choose_image)
-
-        self.image_dir_label = Gtk.Label(label="No directory selected")
-        self.image_dir_label.add_css_class("dim-label")
-        image_section.append(self.image_dir_label)
+if [ -S "$ACTUAL_SOCKET_PATH" ]; then
+    HYPRLAND_EVENT_SOCKET="$ACTUAL_SOCKET_PATH"
+else
+    HYPRLAND_EVENT_SOCKET="/tmp/hypr/$HYPRLAND_INSTANCE_SIGNATURE/.socket2"
+fi
 
-        box.append(image_section)
+# Clients JSON is fetched once per event and shared by the geometry lookups below
+CLIENTS_JSON="[]"
+refresh_clients() {
+    CLIENTS_JSON=$(hyprctl clients -j 2>/dev/null) || CLIENTS_JSON="[]"
+}
 
-        return box
+get_window_geometry() {
+    local addr="$1"
+    jq -r ".[] | select(.address == \\"$addr\\") | \\"\\(.at[0]) \\(.at[1]) \\(.size[0]) \\(.size[1])\\"" <<< "$CLIENTS_JSON"
+}
 
-    def _proceed_to_settings(self):
-        """Validate directory and proceed to settings page"""
-        if not self.video_dir and not self.image_dir:
-            dlg = Gtk.MessageDialog(transient_for=self, flags=0, 
-                                   message_type=Gtk.MessageType.ERROR,
-                                   buttons=Gtk.ButtonsType.OK, 
-                                   text="No directory selected")
-            dlg.format_secondary_text("Please select at least one media directory")
-            dlg.present()
-            return
-        
-        self._push_page("Custom Settings", self.custom_settings_page)
+# Runs in the caller's shell (no command substitution): reads the resized
+# window's geometry from rx ry rw rh and sets ADJ_ADDR plus ADJ_X ADJ_Y
+# ADJ_W ADJ_H for the closest neighbour (ADJ_ADDR is empty if there is none)
+find_adjacent_window() {
+    local resize_addr="$1"
+    local ws_id="$2"
+    local edge="$3"  # "right" or "left"
     
-    def _choose_image_dir(self, *_):
-        dlg = Gtk.FileDialog(title="Select Image Directory")
-        dlg.set_initial_folder(Gio.File.new_for_path(str(HOME)))
-        dlg.select_folder(self, None, self._image_folder_cb)
-
-    def _image_folder_cb(self, dialog, result):
-        try:
-            f = dialog.select_folder_finish(result)
-            self.image_dir = Path(f.get_path())
-            self.image_dir_label.set_text(f"Selected: {self.image_dir.name}")
-        except:
-            pass
-
-    def _choose_video_dir(self, *_):
-        dlg = Gtk.FileDialog(title="Select Media Directory")
-        dlg.set_initial_folder(Gio.File.new_for_path(str(HOME)))
-        dlg.select_folder(self, None, self._folder_cb)
-
-    def _folder_cb(self, dialog, result):
-        try:
-            f = dialog.select_folder_finish(result)
-            self.video_dir = Path(f.get_path())
-            self.video_dir_label.set_text(f"Selected: {self.video_dir.name}")
-        except:
-            pass
-
-    def _page_custom_settings(self):
-        """Custom install settings page with workspace and backend selection"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
-        box.set_margin_start(20)
-        box.set_margin_end(20)
-
-        title = Gtk.Label(label="Configuration Settings")
-        title.add_css_class("title-2")
-        box.append(title)
-
-        # Backend selection
-        backend_title = Gtk.Label(label="Select Wallpaper Backends")
-        backend_title.add_css_class("title-3")
-        box.append(backend_title)
-
-        backend_info = Gtk.Label(label="Choose which types of wallpapers to use:")
-        backend_info.add_css_class("subtitle")
-        box.append(backend_info)
-
-        backend_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+    local addr wx wy ww wh
+    local min_gap=99999
+    ADJ_ADDR=""
+    
+    while read -r addr wx wy ww wh; do
+        [[ "$addr" == "$resize_addr" || -z "$addr" ]] && continue
         
-        self.mpv_check = Gtk.CheckButton(label="MPV (Video wallpapers)")
-        if self.video_dir is not None:
-            self.mpv_check.set_active(True)
-        else:
-            self.mpv_check.set_active(False)
-        self.mpv_check.set_sensitive(True)  # Always selectable
-        self.mpv_check.connect("toggled", self._on_backend_toggled)
-        backend_box.append(self.mpv_check)
-
-        self.hyprpaper_check = Gtk.CheckButton(label="Hyprpaper (Image wallpapers)")
-        if self.image_dir is not None:
-            self.hyprpaper_check.set_active(True)
-        else:
-            self.hyprpaper_check.set_active(False)
-        self.hyprpaper_check.set_sensitive(True)  # Always selectable
-        self.hyprpaper_check.connect("toggled", self._on_backend_toggled)
-        backend_box.append(self.hyprpaper_check)
+        case "$edge" in
+            "right")
+                local resized_right=$((rx + rw))
+                local gap=$((wx - resized_right))
+                local resized_bottom=$((ry + rh))
+                local candidate_bottom=$((wy + wh))
+                
+                if [ $gap -ge -20 ] && [ $gap -le 50 ] && [ $wy -lt $resized_bottom ] && [ $candidate_bottom -gt $ry ] && [ $gap -lt $min_gap ]; then
+                    min_gap=$gap
+                    ADJ_ADDR=$addr ADJ_X=$wx ADJ_Y=$wy ADJ_W=$ww ADJ_H=$wh
+                fi
+                ;;
+            "left")
+                local candidate_right=$((wx + ww))
+                local gap=$((rx - candidate_right))
+                local resized_bottom=$((ry + rh))
+                local candidate_bottom=$((wy + wh))
+                
+                if [ $gap -ge -20 ] && [ $gap -le 50 ] && [ $wy -lt $resized_bottom ] && [ $candidate_bottom -gt $ry ] && [ $gap -lt $min_gap ]; then
+                    min_gap=$gap
+                    ADJ_ADDR=$addr ADJ_X=$wx ADJ_Y=$wy ADJ_W=$ww ADJ_H=$wh
+                fi
+                ;;
+        esac
+    done < <(jq -r ".[] | select(.workspace.id == $ws_id and .floating == true and (.title | test(\\"^mpv-workspace-video\\") | not)) | \\"\\(.address) \\(.at[0]) \\(.at[1]) \\(.size[0]) \\(.size[1])\\"" <<< "$CLIENTS_JSON")
+}
 
-        # Initialize backend_types based on selected directories
-        self._on_backend_toggled(None)
+cleanup() {
+    echo -e "\\nExiting script and closing all active video wallpapers..."
+    pkill -f "mpv --title=${MPV_WINDOW_CLASS}" || true 
+    exit 0
+}
+trap cleanup EXIT
 
-        box.append(backend_box)
+pkill -f "mpv --title=${MPV_WINDOW_CLASS}" || true 
 
-        # Workspace selection
-        ws_title = Gtk.Label(label="Select Workspaces")
-        ws_title.add_css_class("title-3")
-        box.append(ws_title)
+if [ "$TEMP_WORKSPACE_ID" -le 10 ]; then
+    echo "Moving existing windows to temporary Workspace $TEMP_WORKSPACE_ID..."
+    declare -A SAVED_WINDOWS
+    COUNT_MOVED=0
+    
+    while IFS='|' read -r address workspace_id; do
+        if [[ -n "$address" ]] && [[ "$workspace_id" =~ ^[0-9]+$ ]] && [ "$workspace_id" -ge 1 ] && [ "$workspace_id" -le "$NUM_WORKSPACES" ]; then
+            SAVED_WINDOWS["$address"]="$workspace_id"
+            hyprctl dispatch movetoworkspacesilent "$TEMP_WORKSPACE_ID,address:$address" > /dev/null 2>&1
+            COUNT_MOVED=$((COUNT_MOVED + 1))
+        fi
+    done < <(hyprctl clients -j | jq -r '.[] | select(.title | test("^mpv-workspace-video") | not and .workspace.id != -1) | "\\(.address)|\\(.workspace.id)"')
+    
+    echo "Saved and moved $COUNT_MOVED windows to temporary workspace $TEMP_WORKSPACE_ID."
+else
+    echo "Skipping window movement: TEMP_WORKSPACE_ID ($TEMP_WORKSPACE_ID) is outside range 1-10."
+fi
 
-        info = Gtk.Label(label="Select which workspaces to manage:")
-        info.add_css_class("subtitle")
-        box.append(info)
+create_blank_image
+refresh_monitors
+start_all_mpv
+init_hyprpaper_wallpapers
 
-        grid = Gtk.Grid(column_spacing=12, row_spacing=8)
-        grid.set_halign(Gtk.Align.START)
-        grid.set_column_homogeneous(False)
+echo "Waiting for video wallpapers to initialize..."
+sleep 3
 
-        for i in range(1, 10):
-            ws_label = Gtk.Label(label=f"Workspace {i}:")
-            ws_label.set_halign(Gtk.Align.START)
-            grid.attach(ws_label, 0, i - 1, 1, 1)
+if [ "$TEMP_WORKSPACE_ID" -le 10 ]; then
+    echo "Restoring windows from temporary workspace..."
+    for address in "${!SAVED_WINDOWS[@]}"; do
+        original_ws="${SAVED_WINDOWS[$address]}"
+        hyprctl dispatch movetoworkspacesilent "$original_ws,address:$address" > /dev/null 2>&1
+        echo "  ↳ Restored window $address to workspace $original_ws"
+    done
+fi
 
-            ws_check = Gtk.CheckButton()
-            ws_check.connect("toggled", lambda cb, ws=i: self._on_workspace_toggled(cb, ws))
-            grid.attach(ws_check, 1, i - 1, 1, 1)
+sleep 1.0
 
-        scroll = Gtk.ScrolledWindow()
-        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        scroll.set_child(grid)
-        scroll.set_min_content_height(200)
-        box.append(scroll)
+echo "Applying window tiling..."
+for ws_id in $(echo "${SAVED_WINDOWS[@]}" | tr ' ' '\\n' | sort -u); do
+    if [[ "$ws_id" =~ ^[0-9]+$ ]]; then
+        sleep 0.2
+        pseudo_tile_workspace "$ws_id"
+    fi
+done
 
-        # Gap settings
-        gap_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        gap_title = Gtk.Label(label="Gap Settings")
-        gap_title.add_css_class("title-3")
-        gap_box.append(gap_title)
+if [[ $CURRENT_WORKSPACE ]]; then
+    manage_togglefloating "$CURRENT_WORKSPACE"
+fi
 
-        g_box = Gtk.Box(spacing=12, homogeneous=False)
-        g_label = Gtk.Label(label="Window gap (px):")
-        g_label.set_halign(Gtk.Align.START)
-        g_spin = Gtk.SpinButton.new_with_range(0, 60, 1)
-        g_spin.set_value(self.gap_size)
-        g_spin.connect("value-changed", lambda w: setattr(self, "gap_size", int(w.get_value())))
-        g_box.append(g_label)
-        g_box.append(g_spin)
-        gap_box.append(g_box)
+refresh_monitors
+CURRENT_WORKSPACE=$FOCUSED_WS
 
-        t_box = Gtk.Box(spacing=12, homogeneous=False)
-        t_label = Gtk.Label(label="Top gap (px):")
-        t_label.set_halign(Gtk.Align.START)
-        t_spin = Gtk.SpinButton.new_with_range(0, 200, 5)
-        t_spin.set_value(self.top_gap)
-        t_spin.connect("value-changed", lambda w: setattr(self, "top_gap", int(w.get_value())))
-        t_box.append(t_label)
-        t_box.append(t_spin)
-        gap_box.append(t_box)
+# Handle initial workspace (video or image)
+if [[ $CURRENT_WORKSPACE ]]; then
+    has_video=false
+    has_image=false
+    
+    # Check if this workspace has a video
+    if [[ -v VIDEO_MAP[$CURRENT_WORKSPACE] ]]; then
+        send_mpv_command "$CURRENT_WORKSPACE" '{"command":["set_property","pause",false]}'
+        echo "Initial state: Video on Workspace $CURRENT_WORKSPACE is playing."
+        has_video=true
+    fi
+    
+    # Check if this workspace has an image (only if no video)
+    if [ "$has_video" = false ] && [[ -v IMAGE_MAP[$CURRENT_WORKSPACE] ]]; then
+        set_hyprpaper_wallpaper "$CURRENT_WORKSPACE" "${IMAGE_MAP[$CURRENT_WORKSPACE]}"
+        echo "Initial state: Image on Workspace $CURRENT_WORKSPACE is displayed."
+        has_image=true
+    fi
+    
+    # Unload images if we're on a video workspace OR a workspace with no wallpaper
+    if [ "$has_video" = true ] || [ "$has_image" = false ]; then
+        unload_all_images
+    fi
+fi
 
-        box.append(gap_box)
-        return box
+echo "Starting listener for Hyprland workspace events on $HYPRLAND_EVENT_SOCKET..."
 
-    def _on_backend_toggled(self, checkbox):
-        """Handle backend checkbox toggle"""
-        self.backend_types = []
-        if self.mpv_check.get_active():
-            self.backend_types.append("mpv")
-        if self.hyprpaper_check.get_active():
-            self.backend_types.append("hyprpaper")
+declare -A WORKSPACE_WINDOWS
+PREVIOUS_WORKSPACE=$CURRENT_WORKSPACE
 
-    def _on_workspace_toggled(self, checkbox, ws_id):
-        """Handle workspace checkbox toggle"""
-        if checkbox.get_active():
-            self.selected_workspaces.add(ws_id)
-        else:
-            self.selected_workspaces.discard(ws_id)
-        self.num_workspaces = len(self.selected_workspaces)
+# Read events from a long-lived fd instead of piping into the loop: the loop
+# then runs in this shell, so cached state and the persistent mpv connections
+# opened while handling events are never confined to a pipeline subshell
+exec {EVENT_FD}< <(exec socat -u UNIX-CONNECT:"$HYPRLAND_EVENT_SOCKET" -)
+
+# Re-tiling is coalesced: window events only mark their workspace as pending,
+# and the tiling pass runs once the event stream has been quiet for
+# TILE_SETTLE seconds, so a burst of opens/closes costs a single pass
+TILE_SETTLE=0.1
+PENDING_TILE_WS=""
+EVENT_PARTIAL=""
+
+schedule_tile() {
+    if [[ -n "$PENDING_TILE_WS" && "$PENDING_TILE_WS" != "$1" ]]; then
+        pseudo_tile_workspace "$PENDING_TILE_WS"
+    fi
+    PENDING_TILE_WS=$1
+}
 
-    def _page_gallery(self):
-        outer = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        outer.set_margin_top(20)
-        outer.set_margin_bottom(20)
-        outer.set_margin_start(20)
-        outer.set_margin_end(20)
-
-        title = Gtk.Label(label="Select media for workspaces")
-        title.add_css_class("title-2")
-        outer.append(title)
+while :; do
+    read_status=0
+    if [[ -n "$PENDING_TILE_WS" ]]; then
+        IFS= read -r -t "$TILE_SETTLE" -u "$EVENT_FD" event || read_status=$?
+    else
+        IFS= read -r -u "$EVENT_FD" event || read_status=$?
+    fi
+    
+    if (( read_status > 128 )); then
+        # Timed out: keep any partial line for the next read, then tile
+        EVENT_PARTIAL+=$event
+        pseudo_tile_workspace "$PENDING_TILE_WS"
+        PENDING_TILE_WS=""
+        continue
+    fi
+    (( read_status == 0 )) || break
+    event=$EVENT_PARTIAL$event
+    EVENT_PARTIAL=""
+    
+    if [[ $event == monitoradded* || $event == monitorremoved* ]]; then
+        refresh_monitors
+    fi
+    
+    # focusedmon>>MONNAME,WORKSPACENAME: switch to that monitor's cached size
+    if [[ $event == focusedmon* ]]; then
+        event_data=${event#*>>}
+        focused_mon=${event_data%%,*}
+        if [[ -v MONITOR_SIZES[$focused_mon] ]]; then
+            size=${MONITOR_SIZES[$focused_mon]}
+            SCREEN_WIDTH=${size% *}
+            SCREEN_HEIGHT=${size#* }
+        fi
+        if [[ "${event_data#*,}" =~ ^[0-9]+$ ]]; then
+            FOCUSED_WS=${event_data#*,}
+        fi
+    fi
+    
+    if [[ $event == workspace* ]]; then
+        NEW_WORKSPACE=${event#workspace>>}
+        
+        if [[ "$NEW_WORKSPACE" =~ ^[0-9]+$ ]]; then
+            FOCUSED_WS=$NEW_WORKSPACE
+            has_video=false
+            has_image=false
+            
+            # Step 1: Handle ALL video pause/play logic FIRST (complete the entire loop)
+            for ws_id in "${!VIDEO_MAP[@]}"; do
+                if [ "$ws_id" == "$NEW_WORKSPACE" ]; then
+                    send_mpv_command "$ws_id" '{"command":["set_property","pause",false]}'
+                    has_video=true
+                else
+                    send_mpv_command "$ws_id" '{"command":["set_property","pause",true]}'
+                fi
+            done
+            
+            # Step 2: Now handle images based on what workspace we're on
+            if [ "$has_video" = false ] && [[ -v IMAGE_MAP[$NEW_WORKSPACE] ]]; then
+                # Not a video workspace, but this workspace has an image
+                set_hyprpaper_wallpaper "$NEW_WORKSPACE" "${IMAGE_MAP[$NEW_WORKSPACE]}"
+                has_image=true
+            fi
+            
+            # Step 3: Unload images if we're on a video workspace OR a workspace with no image
+            if [ "$has_video" = true ] || [ "$has_image" = false ]; then
+                unload_all_images
+            fi
+            
+            # Step 4: Manage togglefloating based on workspace type
+            manage_togglefloating "$NEW_WORKSPACE"
 
-        h_paned = Gtk.Paned(orientation=Gtk.Orientation.HORIZONTAL)
-        h_paned.set_vexpand(True)
-        h_paned.set_position(450)
-        outer.append(h_paned)
+            PREVIOUS_WORKSPACE=$NEW_WORKSPACE
+        fi
+    fi
+    
+    if [[ $event == openwindow* ]]; then
+        event_data=${event#*>>}
+        NEW_WINDOW_ADDR=${event_data%%,*}
         
-        ws_assignment_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        ws_assignment_box.set_margin_end(10)
-        ws_assignment_box.set_vexpand(True)
-        h_paned.set_start_child(ws_assignment_box)
+        # Give Hyprland a moment to map the window
+        sleep 0.1
         
-        ws_list = sorted(self.selected_workspaces)
-        ws_count = len(ws_list)
+        CURRENT_WS=$FOCUSED_WS
         
-        ws_info = Gtk.Label(label=f"Assign one media item to each of the {ws_count} workspaces")
-        ws_info.set_wrap(True)
-        ws_info.add_css_class("subtitle")
-        ws_assignment_box.append(ws_info)
-
-        grid = Gtk.Grid(column_spacing=12, row_spacing=8)
-        grid.set_halign(Gtk.Align.START)
-        grid.set_column_homogeneous(False) 
+        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
+            default_width=$((SCREEN_WIDTH - GAP_SIZE * 2))
+            default_height=$((SCREEN_HEIGHT - TOP_GAP - GAP_SIZE))
+            
+            # hyprctl --batch only replies once the dispatches have run, so the
+            # tiling pass below already sees the new geometry
+            queue_place "$NEW_WINDOW_ADDR" $default_width $default_height $GAP_SIZE $((GAP_SIZE + TOP_GAP))
+            flush_tile_batch
+            
+            schedule_tile "$CURRENT_WS"
+        fi
+    fi
+    
+    if [[ $event == closewindow* ]]; then
+        CURRENT_WS=$FOCUSED_WS
         
-        media_strings = ["None (Unassigned)"] + [m.title for m in self.media_items]
+        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
+            schedule_tile "$CURRENT_WS"
+        fi
+    fi
+if [[ $event == resizewindow* ]]; then
+        event_data=${event#*>>}
+        RESIZE_ADDR=${event_data%%,*}
         
-        for idx, ws_id in enumerate(ws_list):
-            ws_label = Gtk.Label(label=f"Workspace {ws_id}:")
-            ws_label.set_halign(Gtk.Align.START)
-            grid.attach(ws_label, 0, idx, 1, 1)
-
-            ws_dropdown = Gtk.DropDown.new_from_strings(media_strings)
-            ws_dropdown.set_halign(Gtk.Align.FILL)
-            ws_dropdown.set_hexpand(True)
+        CURRENT_WS=$FOCUSED_WS
+        
+        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
+            refresh_clients
+            # Empty when the window closed before the query; read then
+            # fails, which must not trip set -e and take the helper down
+            read -r rx ry rw rh < <(get_window_geometry "$RESIZE_ADDR") || continue
             
-            current_media_path = self.ws_to_media.get(ws_id)
-            if current_media_path:
-                try:
-                    current_media_title = Path(current_media_path).name
-                    selected_index = media_strings.index(current_media_title)
-                    ws_dropdown.set_selected(selected_index)
-                except ValueError:
-                    ws_dropdown.set_selected(0) 
-            else:
-                ws_dropdown.set_selected(0)
-
-            ws_dropdown.connect("notify::selected", 
-                               lambda dd, _, ws=ws_id, ms=self.media_items: self._on_media_selected(dd, ws, ms))
+            # Find and resize adjacent windows; their geometry comes back
+            # with the match, so no second lookup is needed
+            find_adjacent_window "$RESIZE_ADDR" "$CURRENT_WS" "right"
+            if [[ -n "$ADJ_ADDR" ]]; then
+                resized_right=$((rx + rw))
+                new_width=$((ADJ_X + ADJ_W - resized_right - GAP_SIZE))
+                
+                if [ $new_width -gt 100 ]; then
+                    queue_place "$ADJ_ADDR" $new_width $ADJ_H $((resized_right + GAP_SIZE)) $ADJ_Y
+                    flush_tile_batch
+                fi
+            fi
             
-            grid.attach(ws_dropdown, 1, idx, 1, 1)
+            find_adjacent_window "$RESIZE_ADDR" "$CURRENT_WS" "left"
+            if [[ -n "$ADJ_ADDR" ]]; then
+                new_width=$((rx - ADJ_X - GAP_SIZE))
+                
+                if [ $new_width -gt 100 ]; then
+                    hyprctl dispatch resizewindowpixel "exact $new_width $ADJ_H,address:$ADJ_ADDR" > /dev/null 2>&1
+                fi
+            fi
+        fi
+    fi
+done
+'''
 
-        grid_scroll = Gtk.ScrolledWindow()
-        grid_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        grid_scroll.set_child(grid)
-        grid_scroll.set_min_content_height(200)
+# --- MAIN WINDOW ---
+# Application stylesheet, handed to GTK as-is
+APP_CSS = b"""
+.title-1 { font-size: 32px; font-weight: 700; margin: 12px; }
+.title-2 { font-size: 24px; font-weight: 600; margin: 8px; }
+.title-3 { font-size: 18px; font-weight: 600; }
+.subtitle { font-size: 14px; opacity: 0.8; margin: 4px; }
+.thumbnail { border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.4); }
+.thumbnail:hover { transform: scale(1.03); }
+.thumbnail-card { padding: 8px; border-radius: 8px; background: alpha(@theme_bg_color, 0.5); }
+.thumbnail-card:hover { background: alpha(@theme_bg_color, 0.8); }
+.status-found { color: #26a269; }
+.status-missing { color: #e01b24; }
+.warning { color: #f57707; font-weight: 500; }
+.warning-box { 
+    padding: 20px; 
+    background: alpha(@error_bg_color, 0.3); 
+    border: 3px solid @error_color; 
+    border-radius: 12px; 
+}
+.warning-text { 
+    color: @error_color; 
+    font-weight: 700; 
+    font-size: 16px;
+}
+.info-box { 
+    padding: 12px; 
+    background: alpha(@theme_selected_bg_color, 0.3); 
+    border: 1px solid @theme_selected_bg_color; 
+    border-radius: 8px; 
+}
+.monospace { font-family: monospace; font-size: 11px; opacity: 0.8; }
+"""
 
-        ws_assignment_box.append(grid_scroll)
-        
-        preview_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        preview_box.set_margin_start(10)
-        preview_box.set_vexpand(True)
-        h_paned.set_end_child(preview_box)
+_CSS_PROVIDER = None  # One per process, created by the first _apply_css
 
-        preview_title = Gtk.Label(label="Media Preview Gallery")
-        preview_title.add_css_class("title-3")
-        preview_box.append(preview_title)
+class MainWindow(Gtk.ApplicationWindow if not HAS_ADW else Adw.ApplicationWindow):
+    def __init__(self, app):
+        logger.info("MainWindow.__init__ called")
+        try:
+            super().__init__(application=app)
+            logger.info("✓ ApplicationWindow initialized")
+            self.set_title("Hyprland Video Wallpapers Installer")
+            self.set_default_size(1200, 800)
+            
+            # Set window as floating
+            self.set_decorated(True)
+            
+            logger.info("✓ Window title and size set")
+            
+            self.ws_to_media = {}
+            self.media_to_ws = {}  # Reverse index of ws_to_media
+            self.selected_workspaces = set()
+            self.backend_types = ["mpv"]
+            self.backup_conf_path = None
+            self.hyprpaper_backup_path = None
 
-        preview_info = Gtk.Label(label="Click Preview to view media samples")
-        preview_info.add_css_class("dim-label")
-        preview_box.append(preview_info)
+            if HAS_ADW:
+                try:
+                    Adw.StyleManager.get_default().set_color_scheme(1)
+                    logger.info("✓ Adwaita dark mode set")
+                except Exception as e:
+                    logger.warning("Could not set Adwaita theme: %s", e)
 
-        self.flow = Gtk.FlowBox()
-        self.flow.set_valign(Gtk.Align.START)
-        self.flow.set_max_children_per_line(3)
-        self.flow.set_min_children_per_line(1)
-        self.flow.set_selection_mode(Gtk.SelectionMode.NONE)
+            self._apply_css()
+            logger.info("✓ CSS applied")
 
-        scroll = Gtk.ScrolledWindow()
-        scroll.set_vexpand(True) 
-        scroll.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scroll.set_child(self.flow)
-        preview_box.append(scroll)
-        
-        self.gallery_page = outer 
-        return outer
+            self.stack = Gtk.Stack()
+            self.set_content(self.stack)
+            logger.info("✓ Stack created and set as content")
+            
+            self.video_dir = None
+            self.image_dir = None
 
-    def _load_gallery(self, is_back_navigation=False):
-        if not self.video_dir and not self.image_dir:
-            return
+            self.media_by_path = {}
+            self._scan_generation = 0  # Bumped per scan; stale results are dropped
+            self._scan_done_generation = 0  # Last generation whose scan finished
+            self._scan_progress_text = None  # Latest progress text of the running scan
+            self._warning_dialog = None  # Built on first _show_warning
+            self._log_lock = Lock()
+            self._log_pending = {}  # TextView attribute name -> queued lines
+            self.num_workspaces = 5
+            self.gap_size = 15
+            self.top_gap = 30
+            self.original_hypr_conf = ""
 
-        if not is_back_navigation:
-            self.media_items = []
-
-            # Scan video directory if it was selected
-            if self.video_dir:
-                video_scanner = MediaScanner(self.video_dir, ["mpv"])
-                self.media_items.extend(video_scanner.scan())
-
-            # Scan image directory if it was selected
-            if self.image_dir:
-                image_scanner = MediaScanner(self.image_dir, ["hyprpaper"])
-                self.media_items.extend(image_scanner.scan())
-
-            if not self.media_items:
-                dlg = Gtk.MessageDialog(transient_for=self, flags=0, 
-                                    message_type=Gtk.MessageType.ERROR,
-                                    buttons=Gtk.ButtonsType.OK, text="No media found")
-                dlg.format_secondary_text("No valid media files found in the selected directories for the enabled backends")
-                dlg.present()
-                return
+            self.page_refs = {}
+            self.ws_spin = None
+            
+            # Stopping old wallpaper processes can take a while; don't make
+            # the first window wait on it
+            Thread(target=self._clear_old_processes, daemon=True).start()
 
-        current_paths = {str(m.path) for m in self.media_items}
-        ws_list = sorted(self.selected_workspaces)
-        self.ws_to_media = {ws: path for ws, path in self.ws_to_media.items() 
-                            if path in current_paths and ws in ws_list}
+            logger.info("Creating pages...")
+            self._create_pages()
+            logger.info("✓ Pages created")
+            
+            self._push_page("Welcome", self.welcome_page)
+            logger.info("✓ Welcome page pushed")
+            
+        except Exception as e:
+            logger.error("Error in MainWindow.__init__: %s", e, exc_info=True)
+            raise
 
-        self._page_gallery()
+    def _create_pages(self):
+        """Create the welcome page; other static pages are built on first use"""
+        logger.info("Creating static pages...")
+        self.welcome_page = self._page_welcome()
+        logger.info("✓ Welcome page created")
 
-        self.flow.remove_all()
-        for media in self.media_items:
-            card = ThumbnailCard(media, self._preview_media)
-            self.flow.append(card)
+        self._page_factories = {
+            "Prerequisites": self._page_prereq,
+            "Video Source": self._page_video_source,
+            "Custom Settings": self._page_custom_settings,
+            "Uninstall": self._page_uninstall,
+        }
+        self._pages = {}
+        
+        self.gallery_page = Gtk.Box()
+        self.review_page = Gtk.Box()
+        self.apply_page = Gtk.Box()
+        self.summary_page = Gtk.Box()
+        self.uninstall_progress_page = Gtk.Box()
+        logger.info("✓ Dynamic page placeholders created")
 
-        self._push_page("Gallery", self.gallery_page)
+    def _get_page(self, title):
+        """Return a static page, building it on first request"""
+        if title not in self._pages:
+            self._pages[title] = self._page_factories[title]()
+            logger.info("✓ %s page created", title)
+        return self._pages[title]
 
-    def _preview_media(self, media):
-        """Launch external preview for media"""
-        try:
-            if media.is_video:
-                subprocess.Popen(["mpv", str(media.path), "--loop", "--no-terminal"],
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            elif media.is_image:
-                viewers = ["eog", "feh", "sxiv", "gwenview"]
-                for viewer in viewers:
-                    if shutil.which(viewer):
-                        subprocess.Popen([viewer, str(media.path)],
-                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                        break
-        except Exception as e:
-            print(f"Preview failed: {e}")
+    def _push_page(self, title, page_content=None):
+        """Push page to navigation stack"""
+        if page_content is None:
+            page_content = self._get_page(title)
 
-    def _on_media_selected(self, dropdown, ws_id, media_items):
-        """Handle media selection for a specific workspace"""
-        selected_index = dropdown.get_selected()
+        next_actions = {
+            "Prerequisites": (self.prereq_to_source, "Next"),
+            "Video Source": (self._proceed_to_settings, "Next"),
+            "Custom Settings": (self._load_gallery, "Select Media"),
+            "Gallery": (self._build_review, "Continue to Review"),
+            "Review": (self._run_install_setup, "Apply Installation"),
+        }
         
-        if selected_index == 0:
-            if ws_id in self.ws_to_media:
-                del self.ws_to_media[ws_id]
-            return
-
-        selected_media = media_items[selected_index - 1]
+        next_action_func, next_label = next_actions.get(title, (None, None))
         
-        for existing_ws, existing_path in self.ws_to_media.items():
-            if existing_ws != ws_id and existing_path == str(selected_media.path):
-                dlg = Gtk.MessageDialog(transient_for=self, flags=0,
-                                       message_type=Gtk.MessageType.WARNING,
-                                       buttons=Gtk.ButtonsType.OK,
-                                       text="Media Already Assigned")
-                dlg.format_secondary_text(
-                    f"Media '{selected_media.title}' is already assigned to Workspace {existing_ws}.\n\n"
-                    "Please choose a different media item or unassign the conflicting workspace first."
-                )
-                dlg.present()
-                dropdown.set_selected(0)
-                return
+        content_to_push = page_content
+        if HAS_ADW and title not in ["Welcome", "Summary", "Installing", "Uninstalling", "Uninstall"]:
+            content_to_push = _wrap_with_nav_bar(
+                title, 
+                page_content, 
+                self._pop_page, 
+                next_action_func=next_action_func,
+                next_label=next_label
+            )
         
-        self.ws_to_media[ws_id] = str(selected_media.path)
+        page_name = title.lower().replace(" ", "-")
 
-    def _page_review(self):
-        # Create scrolled window wrapper
-        scroll = Gtk.ScrolledWindow()
-        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        scroll.set_vexpand(True)
+        existing = self.stack.get_child_by_name(page_name)
+        # Dynamic pages (gallery, review) are rebuilt; swap out the stale copy
+        if existing is not None and self.page_refs.get(title) is not page_content:
+            self.stack.remove(existing)
+            existing = None
+        if existing is None:
+            self.stack.add_titled(content_to_push, page_name, title)
+            
+        self.stack.set_visible_child_name(page_name)
+        self.page_refs[title] = page_content
 
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
-        box.set_margin_start(20)
-        box.set_margin_end(20)
+    def _pop_page(self):
+        """Pop page from navigation stack"""
+        current_name = self.stack.get_visible_child_name()
 
-        title = Gtk.Label(label="Review Configuration")
-        title.add_css_class("title-2")
-        box.append(title)
+        flow = {
+            "prerequisites": "welcome",
+            "video-source": "prerequisites" if self.stack.get_child_by_name("prerequisites") else "welcome",
+            "custom-settings": "video-source",
+            "gallery": "custom-settings",
+            "review": "gallery",
+            "installing": "review",
+            "summary": "installing",
+            "uninstall": "welcome"
+        }
+        
+        if current_name in flow:
+            previous_name = flow[current_name]
+            
+            # Clear directory selections when going back from video-source
+            if current_name == "video-source":
+                self.video_dir = None
+                self.image_dir = None
+                self.video_dir_label.set_text("No directory selected")
+                self.image_dir_label.set_text("No directory selected")
+            
+            # Clear selections when going back from custom-settings to video-source
+            elif current_name == "custom-settings":
+                self.selected_workspaces.clear()
+                self.num_workspaces = 5
+                self.gap_size = 15
+                self.top_gap = 30
+            
+            # Clear media selections when going back from gallery to custom-settings
+            elif current_name == "gallery":
+                self.ws_to_media.clear()
+                self.media_to_ws.clear()
+                # Stop a scan still running for this gallery; going forward
+                # again starts a fresh one
+                self._scan_generation += 1
+            
+            # Navigate to previous page
+            if previous_name == "gallery":
+                self._load_gallery(is_back_navigation=True)
+            elif previous_name == "review":
+                self._build_review(is_back_navigation=True)
+            elif previous_name == "custom-settings":
+                # Reset the existing settings page in place
+                self._reset_custom_settings()
+                self._push_page("Custom Settings")
+            elif previous_name == "video-source":
+                self._push_page("Video Source")
+            elif self.stack.get_child_by_name(previous_name):
+                self.stack.set_visible_child_name(previous_name)
+    
+    def prereq_to_source(self):
+        """Transition from prereq to source"""
+        self.video_source_info_label.set_text("Choose a folder containing your wallpapers\n(Videos: MP4, MKV, WebM, MOV, AVI | Images: PNG, JPG, BMP, WebP)")
+        self._push_page("Video Source")
 
-        self.review_label = Gtk.Label(label="")
-        self.review_label.set_wrap(True)
-        self.review_label.set_selectable(True)
-        self.review_label.set_halign(Gtk.Align.START)
-        box.append(self.review_label)
+    def _clear_old_processes(self):
+        """Kill old wallpaper processes and clear sockets (runs in a thread)"""
+        try:
+            # Stop old MPV/hyprpaper wallpaper processes and the helper script
+            # with one signal pass, then wait only as long as they take to die
+            kill_matching(("mpv", "hyprpaper", ".local/bin/hyprland-video-wallpapers.sh"))
+            wait_for_exit({"mpv", "hyprpaper"})
+        
+            # Now clean up the socket files
+            with os.scandir("/tmp") as it:
+                for entry in it:
+                    if not entry.name.startswith("mpv-ws"):
+                        continue
+                    # An mpv still shutting down may remove its own socket
+                    # first; that must not skip the remaining ones
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+            logger.info("Cleared old MPV processes and sockets")
+        except Exception as e:
+            logger.warning("Could not clear MPV processes/sockets: %s", e)
 
-        info_title = Gtk.Label(label="What will happen:")
-        info_title.add_css_class("title-3")
-        info_title.set_halign(Gtk.Align.START)
-        box.append(info_title)
+    # --- PAGE BUILDERS ---
+    def _page_welcome(self):
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
+        box.set_margin_top(40)
+        box.set_margin_bottom(40)
+        box.set_margin_start(40)
+        box.set_margin_end(40)
+        box.set_halign(Gtk.Align.CENTER)
+        box.set_valign(Gtk.Align.CENTER)
 
-        info = Gtk.Label()
-        info.set_wrap(True)
-        info.set_halign(Gtk.Align.START)
+        title = Gtk.Label(label="Hyprland Video Wallpapers")
+        title.add_css_class("title-1")
+        box.append(title)
 
-        # Count video workspaces for dynamic info text
-        video_ws_count = sum(1 for path in self.ws_to_media.values() 
-                            if Path(path).suffix.lower() in VIDEO_EXTS)
+        subtitle = Gtk.Label(label="Transform your desktop with dynamic video and image wallpapers")
+        subtitle.add_css_class("subtitle")
+        box.append(subtitle)
 
-        info_text = (
-            "• Helper scripts will be written to ~/.local/bin\n"
-            "• Configuration will be stored in ~/.config/hyprland-video-wallpapers\n"
-            "• Your hyprland.conf will be backed up and modified to source the new rules\n"
-        )
+        button_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        button_box.set_halign(Gtk.Align.CENTER)
 
-        if video_ws_count > 0:
-            info_text += f"• 'togglefloating' will be disabled on {video_ws_count} video workspace(s), but enabled elsewhere\n"
+        b_install = Gtk.Button(label="Install / Configure")
+        b_install.add_css_class("suggested-action")
+        b_install.set_size_request(200, 40)
+        b_install.connect("clicked", lambda *_: self._start_install())
+        button_box.append(b_install)
+
+        b_uninstall = Gtk.Button(label="Manage / Uninstall")
+        b_uninstall.set_size_request(200, 40)
+        b_uninstall.connect("clicked", lambda *_: self._push_page("Uninstall"))
+        button_box.append(b_uninstall)
+
+        box.append(button_box)
+        return box
 
-        info_text += "• Wallpaper processes (MPV, Hyprpaper) will be launched"
+    def _page_prereq(self):
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
+        box.set_margin_top(20)
+        box.set_margin_bottom(20)
+        box.set_margin_start(20)
+        box.set_margin_end(20)
 
-        info.set_text(info_text)
+        title = Gtk.Label(label="Checking Prerequisites")
+        title.add_css_class("title-2")
+        box.append(title)
+        
+        info = Gtk.Label(label="One or more required tools are missing. Please install them to continue.")
+        info.add_css_class("subtitle")
         box.append(info)
 
-        paths_title = Gtk.Label(label="Target paths:")
-        paths_title.add_css_class("title-3")
-        paths_title.set_halign(Gtk.Align.START)
-        box.append(paths_title)
+        tools = ["ffmpeg", "ffprobe", "mpv", "socat", "jq", "hyprctl", "hyprpaper"]
+        grid = Gtk.Grid(column_spacing=12, row_spacing=6)
+        grid.set_halign(Gtk.Align.START)
+        
+        # Same lookup as _check_prerequisites, so the page and the check agree
+        missing = missing_executables(tools)
+        for i, t in enumerate(tools):
+            found = t not in missing
+            g_lbl = Gtk.Label(label=t)
+            g_lbl.set_halign(Gtk.Align.START)
+            status_text = "✓ Found" if found else "✗ Missing"
+            g_status = Gtk.Label(label=status_text)
+            g_status.add_css_class("status-" + ("found" if found else "missing"))
+            g_status.set_halign(Gtk.Align.START)
+            grid.attach(g_lbl, 0, i, 1, 1)
+            grid.attach(g_status, 1, i, 1, 1)
 
-        paths = Gtk.Label()
-        paths.set_wrap(True)
-        paths.add_css_class("monospace")
-        paths.set_halign(Gtk.Align.START)
-        paths_text = (
-            f"Helper: {HELPER_SCRIPT}\n"
-            f"Config: {CONFIG_DIR}\n"
-            f"Rules: {RULES_DEST}\n"
-            f"Hyprpaper: {HYPRPAPER_CONF}"
-        )
-        paths.set_text(paths_text)
-        box.append(paths)
+        box.append(grid)
+        
+        return box
 
-        # Only show video workspace info if there are video workspaces
-        if video_ws_count > 0:
-            float_warning_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-            float_warning_box.add_css_class("info-box")
-            float_warning_box.set_margin_top(10)
+    def _page_video_source(self):
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
+        box.set_margin_top(20)
+        box.set_margin_bottom(20)
+        box.set_margin_start(20)
+        box.set_margin_end(20)
 
-            float_title = Gtk.Label(label="ℹ️ Note on Video Wallpaper Workspaces")
-            float_title.add_css_class("title-3")
-            float_title.set_halign(Gtk.Align.START)
-            float_warning_box.append(float_title)
+        title = Gtk.Label(label="Select Media Directories")
+        title.add_css_class("title-2")
+        box.append(title)
 
-            float_text = Gtk.Label(label=f"Video wallpapers use a 'pseudo-tiling' system where windows are floated. The 'togglefloating' keybind will be automatically disabled on the {video_ws_count} workspace(s) with video wallpapers, but will remain enabled on other workspaces (including image wallpaper workspaces).")
-            float_text.set_wrap(True)
-            float_text.set_halign(Gtk.Align.START)
-            float_warning_box.append(float_text)
+        # Video directory section
+        video_section = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        video_title = Gtk.Label(label="Video Directory (for MPV backend)")
+        video_title.add_css_class("title-3")
+        video_title.set_halign(Gtk.Align.START)
+        video_section.append(video_title)
 
-            box.append(float_warning_box)
+        video_info = Gtk.Label(label="⚠️ Note: workspaces with video wallpapers will apply 'master' layout rules and disable 'togglefloating' keybind (this does not apply to workspaces with image wallpapers)")
+        video_info.add_css_class("warning")
+        video_info.set_wrap(True)
+        video_info.set_halign(Gtk.Align.START)
+        video_section.append(video_info)
 
-            warning_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-            warning_box.add_css_class("warning-box")
-            warning_box.set_margin_top(20)
-            warning_box.set_margin_bottom(20)
+        b_choose_video = Gtk.Button(label="Choose Video Folder")
+        b_choose_video.add_css_class("suggested-action")
+        b_choose_video.set_size_request(200, 40)
+        b_choose_video.connect("clicked", lambda *_: self._choose_dir("video"))
+        video_section.append(b_choose_video)
 
-            warning_title = Gtk.Label(label="⚠️ IMPORTANT: CLOSE ALL OPEN WINDOWS ⚠️")
-            warning_title.add_css_class("title-2")
-            warning_title.add_css_class("warning-text")
-            warning_box.append(warning_title)
+        self.video_dir_label = Gtk.Label(label="No directory selected")
+        self.video_dir_label.add_css_class("dim-label")
+        video_section.append(self.video_dir_label)
 
-            warning_text = Gtk.Label(label="All currently open windows will be stuck under the wallpaper!\n\nCLOSE ALL WINDOWS BEFORE CLICKING 'Apply Installation' OR RELOADING HYPRLAND")
-            warning_text.set_wrap(True)
-            warning_text.add_css_class("warning-text")
-            warning_box.append(warning_text)
+        box.append(video_section)
 
-            box.append(warning_box)
+        # Image directory section
+        image_section = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        image_section.set_margin_top(20)
 
-        scroll.set_child(box)
-        self.review_page = scroll
-        return scroll
+        image_title = Gtk.Label(label="Image Directory (for Hyprpaper backend)")
+        image_title.add_css_class("title-3")
+        image_title.set_halign(Gtk.Align.START)
+        image_section.append(image_title)
 
-    def _build_review(self, is_back_navigation=False):
-        self._page_review()
-    
-        backend_str = ", ".join(self.backend_types).upper()
-        summary = ""
-        if self.video_dir:
-            summary += f"🎥 Video Directory: {self.video_dir}\n"
-        if self.image_dir:
-            summary += f"🖼️ Image Directory: {self.image_dir}\n"
-        summary += f"🖥️ Workspaces to manage: {self.num_workspaces}\n"
-        summary += f"🎨 Backends: {backend_str}\n"
-        summary += f"📏 Window Gap: {self.gap_size}px\n"
-        summary += f"📐 Top Gap: {self.top_gap}px\n\n"
-        summary += "Workspace Assignments:\n"
+        b_choose_image = Gtk.Button(label="Choose Image Folder")
+        b_choose_image.add_css_class("suggested-action")
+        b_choose_image.set_size_request(200, 40)
+        b_choose_image.connect("clicked", lambda *_: self._choose_dir("image"))
+        image_section.append(b_choose_image)
 
-        assigned_count = 0
-        sorted_assignments = sorted(self.ws_to_media.items())
+        self.image_dir_label = Gtk.Label(label="No directory selected")
+        self.image_dir_label.add_css_class("dim-label")
+        image_section.append(self.image_dir_label)
 
-        for ws_id, media_path_str in sorted_assignments:
-            media_title = Path(media_path_str).name
-            ext = Path(media_path_str).suffix.lower()
-            media_type = "🎥" if ext in VIDEO_EXTS else "🖼️"
-            summary += f"  WS{ws_id}: {media_type} {media_title}\n"
-            assigned_count += 1
+        box.append(image_section)
 
-        if assigned_count == 0:
-            summary += "  ⚠️ No media assigned! (Installation will proceed but no wallpapers will start)\n"
+        return box
 
-        self.review_label.set_text(summary)
-        self._push_page("Review", self.review_page)
+    def _proceed_to_settings(self):
+        """Validate directory and proceed to settings page"""
+        if not self.video_dir and not self.image_dir:
+            self._show_warning("No directory selected",
+                               "Please select at least one media directory",
+                               Gtk.MessageType.ERROR)
+            return
+        
+        self._push_page("Custom Settings")
+
+    def _show_warning(self, title, secondary, message_type=Gtk.MessageType.WARNING):
+        """Show a modal OK dialog; one instance is built once and reused"""
+        if self._warning_dialog is None:
+            self._warning_dialog = Gtk.MessageDialog(transient_for=self, modal=True,
+                                                     buttons=Gtk.ButtonsType.OK)
+            self._warning_dialog.connect("response", lambda dlg, _r: dlg.hide())
+        self._warning_dialog.set_property("message-type", message_type)
+        self._warning_dialog.set_property("text", title)
+        self._warning_dialog.format_secondary_text(secondary)
+        self._warning_dialog.present()
+    
+    def _choose_dir(self, kind):
+        """Open a folder picker for the "video" or "image" directory"""
+        from gi.repository import Gio
+        title = "Select Media Directory" if kind == "video" else "Select Image Directory"
+        dlg = Gtk.FileDialog(title=title)
+        dlg.set_initial_folder(Gio.File.new_for_path(str(HOME)))
+        dlg.select_folder(self, None, self._folder_cb, kind)
 
-    def _run_install_setup(self):
-        self._page_apply()
-        self._push_page("Installing", self.apply_page)
-        self._run_install_async() 
+    def _folder_cb(self, dialog, result, kind):
+        try:
+            f = dialog.select_folder_finish(result)
+            folder = Path(f.get_path())
+            setattr(self, f"{kind}_dir", folder)
+            getattr(self, f"{kind}_dir_label").set_text(f"Selected: {folder.name}")
+        except:
+            pass
 
-    def _page_apply(self):
+    def _page_custom_settings(self):
+        """Custom install settings page with workspace and backend selection"""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
         box.set_margin_top(20)
         box.set_margin_bottom(20)
         box.set_margin_start(20)
         box.set_margin_end(20)
 
-        title = Gtk.Label(label="Installing...")
+        title = Gtk.Label(label="Configuration Settings")
         title.add_css_class("title-2")
         box.append(title)
 
-        self.apply_log = Gtk.TextView()
-        self.apply_log.set_editable(False)
-        self.apply_log.set_monospace(True)
-        scroll = Gtk.ScrolledWindow()
-        scroll.set_child(self.apply_log)
-        scroll.set_min_content_height(400)
-        box.append(scroll)
-        
-        self.apply_page = box
-        return box
+        # Backend selection
+        backend_title = Gtk.Label(label="Select Wallpaper Backends")
+        backend_title.add_css_class("title-3")
+        box.append(backend_title)
 
-    def _log(self, msg):
-        """Add message to log (Thread-safe)"""
-        def do_log():
-            buf = self.apply_log.get_buffer()
-            buf.insert(buf.get_end_iter(), msg + "\n")
-            insert_mark = buf.get_insert()
-            self.apply_log.scroll_to_mark(insert_mark, 0.0, False, 0.0, 0.0)
-            
-        GLib.idle_add(do_log)
+        backend_info = Gtk.Label(label="Choose which types of wallpapers to use:")
+        backend_info.add_css_class("subtitle")
+        box.append(backend_info)
 
-    def _run_install_async(self):
-        """Run installer in background thread"""
-        thread = Thread(target=self._run_install, daemon=True)
-        thread.start()
+        backend_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        
+        self.mpv_check = Gtk.CheckButton(label="MPV (Video wallpapers)")
+        if self.video_dir is not None:
+            self.mpv_check.set_active(True)
+        else:
+            self.mpv_check.set_active(False)
+        self.mpv_check.set_sensitive(True)  # Always selectable
+        self.mpv_check.connect("toggled", self._on_backend_toggled)
+        backend_box.append(self.mpv_check)
 
-    def _run_install(self):
-        """Execute full installation"""
-        try:
-            self._log("🛑 Stopping conflicting processes...")
-            run(["pkill", "-f", "mpvpaper"])
-            run(["pkill", "-f", "mpv --title=mpv-workspace-video"])
-            run(["pkill", "-f", "hyprpaper"])
+        self.hyprpaper_check = Gtk.CheckButton(label="Hyprpaper (Image wallpapers)")
+        if self.image_dir is not None:
+            self.hyprpaper_check.set_active(True)
+        else:
+            self.hyprpaper_check.set_active(False)
+        self.hyprpaper_check.set_sensitive(True)  # Always selectable
+        self.hyprpaper_check.connect("toggled", self._on_backend_toggled)
+        backend_box.append(self.hyprpaper_check)
 
-            if "mpv" in self.backend_types:
-                self._log("📝 Writing MPV helper script...")
-                self._write_helper_script()
+        # Initialize backend_types based on selected directories
+        self._on_backend_toggled(None)
 
-            if "hyprpaper" in self.backend_types:
-                self._log("📝 Configuring Hyprpaper...")
-                self._configure_hyprpaper()
+        box.append(backend_box)
 
-            self._log("📋 Writing Hyprland rules...")
-            self._write_rules_file()
+        # Workspace selection
+        ws_title = Gtk.Label(label="Select Workspaces")
+        ws_title.add_css_class("title-3")
+        box.append(ws_title)
 
-            self._log("⚙️ Configuring hyprland.conf...")
-            self._configure_hyprland()
+        info = Gtk.Label(label="Select which workspaces to manage:")
+        info.add_css_class("subtitle")
+        box.append(info)
 
-            self._log("🚫 Disabling togglefloating...")
-            self._disable_togglefloating()
+        grid = Gtk.Grid(column_spacing=12, row_spacing=8)
+        grid.set_halign(Gtk.Align.START)
+        grid.set_column_homogeneous(False)
 
-            self._log("💾 Writing configuration...")
-            self._write_config_file()
+        self._ws_checks = []
+        for i in range(1, 10):
+            ws_label = Gtk.Label(label=f"Workspace {i}:")
+            ws_label.set_halign(Gtk.Align.START)
+            grid.attach(ws_label, 0, i - 1, 1, 1)
 
-            self._log("✅ Installation complete! Starting wallpapers...")
-            
-            self._start_wallpapers_silent()
-            
-            self._log("⏳ Waiting for wallpapers to initialize...")
-            time.sleep(5)
-            
-            self._log("✅ Wallpapers started! Pushing summary page...")
-            
-            def show_summary_and_close():
-                self._push_page("Summary", self._page_summary())
-                GLib.timeout_add(3000, self._close_app)
-            
-            GLib.idle_add(show_summary_and_close)
-            
-        except Exception as e:
-            logger.error(f"Error during installation: {e}", exc_info=True)
-            self._log(f"❌ FATAL ERROR during installation: {e}")
-            self._log("Please check the log file for details.")
-    def _close_app(self):
-        """Helper function to close the window."""
-        logger.info("Auto-closing application after successful install.")
-        if self.get_application():
-            self.get_application().quit()
-        else:
-            self.close()
-        return False
+            ws_check = Gtk.CheckButton()
+            ws_check.connect("toggled", lambda cb, ws=i: self._on_workspace_toggled(cb, ws))
+            grid.attach(ws_check, 1, i - 1, 1, 1)
+            self._ws_checks.append(ws_check)
 
-    def _write_helper_script(self):
-        """Write the main MPV helper script with improved Hyprpaper IPC control."""
-        HELPER_SCRIPT.parent.mkdir(parents=True, exist_ok=True)
-        
-        # proper hyprpaper ipc control
-        content = '''#!/bin/bash
-set -euo pipefail
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scroll.set_child(grid)
+        scroll.set_min_content_height(200)
+        box.append(scroll)
 
-CONFIG_FILE="${HOME}/.config/hyprland-video-wallpapers/config.conf"
-if [ ! -f "$CONFIG_FILE" ]; then
-    echo "Error: Configuration file not found at $CONFIG_FILE" >&2
-    exit 1
-fi
-source "$CONFIG_FILE"
+        # Gap settings
+        gap_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        gap_title = Gtk.Label(label="Gap Settings")
+        gap_title.add_css_class("title-3")
+        gap_box.append(gap_title)
 
-MPV_WINDOW_CLASS="mpv-workspace-video"
-MPV_BASE_SOCKET="/tmp/mpv-ws"
-HYPRPAPER_RUNNING=false
+        g_box = Gtk.Box(spacing=12, homogeneous=False)
+        g_label = Gtk.Label(label="Window gap (px):")
+        g_label.set_halign(Gtk.Align.START)
+        g_spin = Gtk.SpinButton.new_with_range(0, 60, 1)
+        g_spin.set_value(self.gap_size)
+        g_spin.connect("value-changed", lambda w: setattr(self, "gap_size", int(w.get_value())))
+        g_box.append(g_label)
+        g_box.append(g_spin)
+        gap_box.append(g_box)
+        self._g_spin = g_spin
 
-get_socket_path() {
-    echo "${MPV_BASE_SOCKET}-$1-ipc"
-}
+        t_box = Gtk.Box(spacing=12, homogeneous=False)
+        t_label = Gtk.Label(label="Top gap (px):")
+        t_label.set_halign(Gtk.Align.START)
+        t_spin = Gtk.SpinButton.new_with_range(0, 200, 5)
+        t_spin.set_value(self.top_gap)
+        t_spin.connect("value-changed", lambda w: setattr(self, "top_gap", int(w.get_value())))
+        t_box.append(t_label)
+        t_box.append(t_spin)
+        gap_box.append(t_box)
+        self._t_spin = t_spin
 
-get_window_title() {
-    echo "${MPV_WINDOW_CLASS}-$1"
-}
+        box.append(gap_box)
+        return box
 
-send_mpv_command() {
-    local workspace_id="$1"
-    local command_json="$2"
-    local socket_path=$(get_socket_path "$workspace_id")
-    
-    if [ -S "$socket_path" ]; then
-        echo "$command_json" | socat - "$socket_path" > /dev/null 2>&1
-    fi 
-}
+    def _reset_custom_settings(self):
+        """Put the settings page widgets back to their initial state"""
+        self.mpv_check.set_active(self.video_dir is not None)
+        self.hyprpaper_check.set_active(self.image_dir is not None)
+        for ws_check in self._ws_checks:
+            ws_check.set_active(False)
+        self.selected_workspaces.clear()
+        self.num_workspaces = 5
+        self.gap_size = 15
+        self.top_gap = 30
+        self._g_spin.set_value(self.gap_size)
+        self._t_spin.set_value(self.top_gap)
 
-create_blank_image() {
-    # Create a small black PNG to use as blank wallpaper
-    BLANK_IMAGE="/tmp/hyprpaper_blank.png"
-    
-    if [ ! -f "$BLANK_IMAGE" ]; then
-        # Create a 10x10 black PNG using ffmpeg
-        ffmpeg -f lavfi -i color=black:s=10x10:d=0.1 -frames:v 1 "$BLANK_IMAGE" -y 2>/dev/null
-        echo "Created blank wallpaper: $BLANK_IMAGE"
-    fi
-}
+    def _on_backend_toggled(self, checkbox):
+        """Handle backend checkbox toggle"""
+        self.backend_types = []
+        if self.mpv_check.get_active():
+            self.backend_types.append("mpv")
+        if self.hyprpaper_check.get_active():
+            self.backend_types.append("hyprpaper")
 
-# Hyprpaper control functions
-ensure_hyprpaper() {
-    if ! pgrep -x hyprpaper > /dev/null; then
-        hyprpaper &
-        sleep 1
-        HYPRPAPER_RUNNING=true
-    else
-        echo "Hyprpaper already running"
-    fi
-}
+    def _on_workspace_toggled(self, checkbox, ws_id):
+        """Handle workspace checkbox toggle"""
+        if checkbox.get_active():
+            self.selected_workspaces.add(ws_id)
+        else:
+            self.selected_workspaces.discard(ws_id)
+        self.num_workspaces = len(self.selected_workspaces)
 
-manage_togglefloating() {
-    local workspace_id="$1"
-    local has_video=false
-    
-    # Check if this workspace has a video wallpaper
-    for entry in "${VIDEO_MAP[@]}"; do
-        IFS=':' read -r ws_id video_path <<< "$entry"
-        if [ "$ws_id" == "$workspace_id" ]; then
-            has_video=true
-            break
-        fi
-    done
-    
-    local togglefloat_conf="${HOME}/.config/hyprland-video-wallpapers/togglefloating.conf"
-    local togglefloat_binds="${HOME}/.config/hyprland-video-wallpapers/togglefloating_binds.txt"
-    
-    if [ "$has_video" = true ]; then
-        # Disable togglefloating for video workspace
-        echo "# Togglefloating disabled on video workspace $workspace_id" > "$togglefloat_conf"
-        echo "Disabled togglefloating on video workspace $workspace_id"
-    else
-        # Enable togglefloating for non-video workspace
-        if [ -f "$togglefloat_binds" ]; then
-            {
-                echo "# Togglefloating enabled on non-video workspace $workspace_id"
-                cat "$togglefloat_binds"
-            } > "$togglefloat_conf"
-            echo "Enabled togglefloating on non-video workspace $workspace_id"
-        fi
-    fi
-}
+    def _page_gallery(self):
+        outer = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        outer.set_margin_top(20)
+        outer.set_margin_bottom(20)
+        outer.set_margin_start(20)
+        outer.set_margin_end(20)
 
-set_hyprpaper_wallpaper() {
-    local workspace_id="$1"
-    local image_path="$2"
-    
-    ensure_hyprpaper
-    
-    # Preload the specific image
-    hyprctl hyprpaper preload "$image_path" 2>/dev/null || true
-    sleep 0.3
-    
-    # Get all monitors
-    local monitors=$(hyprctl monitors -j | jq -r '.[].name')
-    
-    # Set the wallpaper on all monitors
-    while IFS= read -r monitor; do
-        hyprctl hyprpaper wallpaper "$monitor,$image_path" 2>/dev/null || true
-        echo "Setting wallpaper on monitor $monitor: $image_path"
-    done <<< "$monitors"
-}
+        title = Gtk.Label(label="Select media for workspaces")
+        title.add_css_class("title-2")
+        outer.append(title)
 
-unload_all_images() {
-    # Set blank wallpaper to clear images behind videos
-    if pgrep -x hyprpaper > /dev/null; then
-        echo "Setting blank wallpaper..."
+        h_paned = Gtk.Paned(orientation=Gtk.Orientation.HORIZONTAL)
+        h_paned.set_vexpand(True)
+        h_paned.set_position(450)
+        outer.append(h_paned)
         
-        # Ensure blank image exists
-        if [ -f "$BLANK_IMAGE" ]; then
-            # Preload blank image
-            hyprctl hyprpaper preload "$BLANK_IMAGE" 2>/dev/null || true
-            sleep 0.1
-            
-            # Get all monitors and set blank on each
-            local monitors=$(hyprctl monitors -j | jq -r '.[].name')
-            while IFS= read -r monitor; do
-                hyprctl hyprpaper wallpaper "$monitor,$BLANK_IMAGE" 2>/dev/null || true
-            done <<< "$monitors"
+        ws_assignment_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        ws_assignment_box.set_margin_end(10)
+        ws_assignment_box.set_vexpand(True)
+        h_paned.set_start_child(ws_assignment_box)
+        
+        ws_list = sorted(self.selected_workspaces)
+        ws_count = len(ws_list)
+        
+        ws_info = Gtk.Label(label=f"Assign one media item to each of the {ws_count} workspaces")
+        ws_info.set_wrap(True)
+        ws_info.add_css_class("subtitle")
+        ws_assignment_box.append(ws_info)
+
+        grid = Gtk.Grid(column_spacing=12, row_spacing=8)
+        grid.set_halign(Gtk.Align.START)
+        grid.set_column_homogeneous(False) 
+        
+        media_list = sorted(self.media_by_path.values(), key=media_sort_key)
+        media_strings = ["None (Unassigned)"] + [m.title for m in media_list]
+        title_to_index = {title: i for i, title in enumerate(media_strings)}
+        # One model filled in a single batch, shared by every dropdown;
+        # items streamed in by a running scan are appended to both
+        media_model = Gtk.StringList.new(media_strings)
+        self.gallery_media = media_list
+        self.gallery_keys = [media_sort_key(m) for m in media_list]
+        self.gallery_model = media_model
+        
+        for idx, ws_id in enumerate(ws_list):
+            ws_label = Gtk.Label(label=f"Workspace {ws_id}:")
+            ws_label.set_halign(Gtk.Align.START)
+            grid.attach(ws_label, 0, idx, 1, 1)
+
+            ws_dropdown = Gtk.DropDown.new(media_model, None)
+            ws_dropdown.set_halign(Gtk.Align.FILL)
+            ws_dropdown.set_hexpand(True)
             
-            # Now unload all the actual image wallpapers (but keep blank loaded)
-            for entry in "${IMAGE_MAP[@]}"; do
-                IFS=':' read -r ws_id image_path <<< "$entry"
-                hyprctl hyprpaper unload "$image_path" 2>/dev/null || true
-            done
-        fi
-    fi
-}
+            current_media_path = self.ws_to_media.get(ws_id)
+            if current_media_path:
+                current_media_title = Path(current_media_path).name
+                ws_dropdown.set_selected(title_to_index.get(current_media_title, 0))
+            else:
+                ws_dropdown.set_selected(0)
 
-clear_hyprpaper_wallpaper() {
-    # When leaving an image workspace, we need to clear the wallpaper
-    # Hyprpaper doesn't have a "clear" command, so we use a dummy approach:
-    # We'll set it to the first available wallpaper or unload all
-    if pgrep -x hyprpaper > /dev/null; then
-        # Unload all wallpapers to clear them from display
-        hyprctl hyprpaper unload all 2>/dev/null || true
-    fi
-}
+            ws_dropdown.connect("notify::selected", 
+                               lambda dd, _, ws=ws_id, ms=media_list: self._on_media_selected(dd, ws, ms))
+            
+            grid.attach(ws_dropdown, 1, idx, 1, 1)
 
-start_all_mpv() {
-    echo "Starting MPV instances for all defined workspaces..."
-    
-    local monitor_info=$(hyprctl monitors -j | jq -r '.[] | select(.focused) | "\\(.width) \\(.height)"')
-    read -r SCREEN_WIDTH SCREEN_HEIGHT <<< "$monitor_info"
+        grid_scroll = Gtk.ScrolledWindow()
+        grid_scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        grid_scroll.set_child(grid)
+        grid_scroll.set_min_content_height(200)
 
-    for entry in "${VIDEO_MAP[@]}"; do
-        IFS=':' read -r ws_id video_path <<< "$entry"
-        
-        local window_title=$(get_window_title "$ws_id")
-        local socket_path=$(get_socket_path "$ws_id")
+        ws_assignment_box.append(grid_scroll)
         
-        rm -f "$socket_path"
+        preview_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        preview_box.set_margin_start(10)
+        preview_box.set_vexpand(True)
+        h_paned.set_end_child(preview_box)
 
-        mpv \\
-            --no-osc --no-stop-screensaver \\
-            --input-ipc-server="$socket_path" \\
-            --loop --video-sync=display-resample \\
-            --title="$window_title" \\
-            --geometry="${SCREEN_WIDTH}x${SCREEN_HEIGHT}+0+0" \\
-            "$video_path" &
-        
-        sleep 2.0
-        
-        hyprctl dispatch movetoworkspace "$ws_id,title:$window_title" > /dev/null 2>&1
-        sleep 0.5
+        preview_title = Gtk.Label(label="Media Preview Gallery")
+        preview_title.add_css_class("title-3")
+        preview_box.append(preview_title)
+
+        preview_info = Gtk.Label(label="Click Preview to view media samples")
+        preview_info.add_css_class("dim-label")
+        preview_box.append(preview_info)
+
+        # Shown while a scan is still streaming items into the gallery
+        self.scan_status = Gtk.Box(spacing=8, halign=Gtk.Align.CENTER)
+        spinner = Gtk.Spinner()
+        spinner.set_spinning(True)
+        self.scan_status.append(spinner)
+        self.scan_progress_label = Gtk.Label(label="Scanning media and generating thumbnails...")
+        self.scan_progress_label.add_css_class("dim-label")
+        self.scan_status.append(self.scan_progress_label)
+        self.scan_status.set_visible(False)
+        preview_box.append(self.scan_status)
+
+        # GridView only realizes cards for the visible rows and recycles them
+        # while scrolling, so large folders don't allocate a widget per file
+        from gi.repository import Gio
+        self.gallery_store = Gio.ListStore.new(MediaItem)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", lambda _f, li: li.set_child(ThumbnailCard(self._preview_media)))
+        factory.connect("bind", lambda _f, li: li.get_child().bind(li.get_item()))
+        factory.connect("unbind", lambda _f, li: li.get_child().unbind())
+
+        self.flow = Gtk.GridView.new(Gtk.NoSelection.new(self.gallery_store), factory)
+        self.flow.set_max_columns(3)
+        self.flow.set_min_columns(1)
+
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_vexpand(True) 
+        scroll.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        scroll.set_child(self.flow)
+        preview_box.append(scroll)
         
-        hyprctl dispatch focuswindow "title:$window_title" > /dev/null 2>&1
-        hyprctl dispatch layoutmsg "focusmaster master" > /dev/null 2>&1
-        hyprctl dispatch splitratio exact 1.0 > /dev/null 2>&1
+        self.gallery_page = outer 
+        return outer
+
+    def _load_gallery(self, is_back_navigation=False):
+        if not self.video_dir and not self.image_dir:
+            return
+
+        if is_back_navigation:
+            self._show_gallery()
+            return
+
+        # Show the (empty) gallery right away; the scan probes every file with
+        # ffprobe/ffmpeg off the main loop and streams items in as they land
+        self._scan_generation += 1
+        self._scan_progress_text = None
+        self.media_by_path = {}
+        self._show_gallery()
+        thread = Thread(target=self._scan_worker,
+                        args=(self.video_dir, self.image_dir, self._scan_generation),
+                        daemon=True)
+        thread.start()
+
+    def _update_scan_progress(self, counts, generation):
+        """Show how many items of each folder have been probed"""
+        if generation == self._scan_generation:
+            parts = [f"{kind} {done}/{total}" for kind, (done, total) in counts]
+            self._scan_progress_text = f"Generating thumbnails... {', '.join(parts)}"
+            self.scan_progress_label.set_text(self._scan_progress_text)
+        return False
+
+    def _scan_worker(self, video_dir, image_dir, generation):
+        """Scan the selected directories (runs in a background thread)"""
+        # Items are handed to the main loop in batches: the first ready item
+        # schedules a flush, and everything that lands before it runs rides along
+        ready = []
+        lock = Lock()
+
+        def flush():
+            with lock:
+                batch = ready[:]
+                ready.clear()
+            self._append_media(batch, generation)
+            return False
+
+        def on_item(item):
+            with lock:
+                ready.append(item)
+                if len(ready) > 1:
+                    return
+            GLib.idle_add(flush)
+
+        # Each folder keeps its own counter so the label doesn't flip between them
+        counts = {}
+
+        def progress_for(kind):
+            def progress(done, total):
+                with lock:
+                    counts[kind] = (done, total)
+                    snapshot = [(k, counts[k]) for k in ("videos", "images") if k in counts]
+                GLib.idle_add(self._update_scan_progress, snapshot, generation)
+            return progress
+
+        # Leaving the gallery or starting another scan bumps the generation
+        cancelled = lambda: generation != self._scan_generation
+        try:
+            # Scan the video and image directories side by side
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = []
+                if video_dir:
+                    futures.append(pool.submit(MediaScanner(video_dir, ["mpv"]).scan,
+                                               progress_for("videos"), on_item, cancelled))
+                if image_dir:
+                    futures.append(pool.submit(MediaScanner(image_dir, ["hyprpaper"]).scan,
+                                               progress_for("images"), on_item, cancelled))
+                for future in futures:
+                    future.result()
+        except Exception as e:
+            logger.error("Error scanning media: %s", e, exc_info=True)
+
+        # Queued after any pending flush, so it sees the complete result
+        GLib.idle_add(self._finish_scan, generation)
+
+    def _append_media(self, batch, generation):
+        """Add a batch of scanned items to the gallery and the dropdowns"""
+        # A newer scan was started, or this one was abandoned
+        if generation != self._scan_generation or not batch:
+            return
+        # Items arrive in completion order; slot each one in at its sorted
+        # position so the gallery and dropdowns read the same on every run
+        for m in sorted(batch, key=media_sort_key):
+            self.media_by_path[str(m.path)] = m
+            key = media_sort_key(m)
+            i = bisect_right(self.gallery_keys, key)
+            self.gallery_keys.insert(i, key)
+            self.gallery_media.insert(i, m)
+            self.gallery_model.splice(i + 1, 0, [m.title])
+            self.gallery_store.insert(i, m)
+
+    def _finish_scan(self, generation):
+        """Hide the scan status, or go back if nothing was found"""
+        if generation != self._scan_generation:
+            return False
+        self._scan_done_generation = generation
+        self.scan_status.set_visible(False)
+
+        if not self.media_by_path and self.stack.get_visible_child_name() == "gallery":
+            self.stack.set_visible_child_name("custom-settings")
+            self._show_warning("No media found",
+                               "No valid media files found in the selected directories for the enabled backends",
+                               Gtk.MessageType.ERROR)
+        return False
+
+    def _show_gallery(self):
+        """Build the gallery page from self.media_by_path and push it"""
+        ws_list = sorted(self.selected_workspaces)
+        self.ws_to_media = {ws: path for ws, path in self.ws_to_media.items() 
+                            if path in self.media_by_path and ws in ws_list}
+        self.media_to_ws = {path: ws for ws, path in self.ws_to_media.items()}
+
+        self._page_gallery()
+
+        self.gallery_store.splice(0, self.gallery_store.get_n_items(), self.gallery_media)
+
+        # The page is rebuilt on back navigation too; keep showing the status
+        # of a scan that is still streaming items in
+        if self._scan_done_generation != self._scan_generation:
+            self.scan_status.set_visible(True)
+            if self._scan_progress_text:
+                self.scan_progress_label.set_text(self._scan_progress_text)
+
+        self._push_page("Gallery", self.gallery_page)
+
+    def _preview_media(self, media):
+        """Launch external preview for media"""
+        try:
+            # Our fds are non-inheritable already (see run()), so skip the
+            # fd-closing pass and let CPython use posix_spawn
+            if media.is_video:
+                subprocess.Popen(["mpv", str(media.path), "--loop", "--no-terminal"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               close_fds=False)
+            elif media.is_image:
+                viewers = ["eog", "feh", "sxiv", "gwenview"]
+                for viewer in viewers:
+                    if shutil.which(viewer):
+                        subprocess.Popen([viewer, str(media.path)],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       close_fds=False)
+                        break
+        except Exception as e:
+            print(f"Preview failed: {e}")
+
+    def _on_media_selected(self, dropdown, ws_id, media_items):
+        """Handle media selection for a specific workspace"""
+        selected_index = dropdown.get_selected()
         
-        echo "  ↳ Started video for Workspace $ws_id"
-        send_mpv_command "$ws_id" '{"command":["set_property","pause",true]}'
-    done
-}
+        if selected_index == 0:
+            old_path = self.ws_to_media.pop(ws_id, None)
+            if old_path is not None:
+                del self.media_to_ws[old_path]
+            return
 
-# Initialize Hyprpaper wallpapers
-init_hyprpaper_wallpapers() {
-    if [ ${#IMAGE_MAP[@]} -gt 0 ]; then
-        echo "Initializing Hyprpaper wallpapers..."
-        ensure_hyprpaper
+        selected_media = media_items[selected_index - 1]
+        selected_path = str(selected_media.path)
+        
+        existing_ws = self.media_to_ws.get(selected_path)
+        if existing_ws is not None and existing_ws != ws_id:
+            self._show_warning(
+                "Media Already Assigned",
+                f"Media '{selected_media.title}' is already assigned to Workspace {existing_ws}.\n\n"
+                "Please choose a different media item or unassign the conflicting workspace first."
+            )
+            dropdown.set_selected(0)
+            return
         
-        # Note: We preload images on-demand now to avoid conflicts with video workspaces
-        echo "Hyprpaper ready for dynamic image switching"
-    fi
-}
+        old_path = self.ws_to_media.get(ws_id)
+        if old_path is not None:
+            del self.media_to_ws[old_path]
+        self.ws_to_media[ws_id] = selected_path
+        self.media_to_ws[selected_path] = ws_id
 
-pseudo_tile_workspace() {
-    local ws_id="$1"
-    
-    local windows=$(hyprctl clients -j | jq -r ".[] | select(.workspace.id == $ws_id and .floating == true and (.title | test(\\"^mpv-workspace-video\\") | not)) | .address")
-    
-    local win_array=()
-    while IFS= read -r addr; do
-        [[ -n "$addr" ]] && win_array+=("$addr")
-    done <<< "$windows"
-    
-    local win_count=${#win_array[@]}
-    [[ $win_count -eq 0 ]] && return
-    
-    local monitor_info=$(hyprctl monitors -j | jq -r '.[] | select(.focused) | "\\(.width) \\(.height)"')
-    read -r SCREEN_WIDTH SCREEN_HEIGHT <<< "$monitor_info"
-    
-    local usable_width=$((SCREEN_WIDTH - GAP_SIZE * 2))
-    local usable_height=$((SCREEN_HEIGHT - TOP_GAP - GAP_SIZE * 2))
-    local start_y=$((GAP_SIZE + TOP_GAP))
-    
-    case $win_count in
-        1)
-            hyprctl dispatch resizewindowpixel "exact $usable_width $usable_height,address:${win_array[0]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $start_y,address:${win_array[0]}" > /dev/null 2>&1
-            ;;
-        2)
-            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
-            hyprctl dispatch resizewindowpixel "exact $half_width $usable_height,address:${win_array[0]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $start_y,address:${win_array[0]}" > /dev/null 2>&1
-            
-            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
-            hyprctl dispatch resizewindowpixel "exact $half_width $usable_height,address:${win_array[1]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $half_width_gap $start_y,address:${win_array[1]}" > /dev/null 2>&1
-            ;;
-        3)
-            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
-            local half_height=$(( (usable_height - GAP_SIZE) / 2 ))
-            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
-            local half_height_gap=$((start_y + half_height + GAP_SIZE))
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $usable_height,address:${win_array[0]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $start_y,address:${win_array[0]}" > /dev/null 2>&1
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[1]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $half_width_gap $start_y,address:${win_array[1]}" > /dev/null 2>&1
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[2]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $half_width_gap $half_height_gap,address:${win_array[2]}" > /dev/null 2>&1
-            ;;
-        4)
-            local half_width=$(( (usable_width - GAP_SIZE) / 2 ))
-            local half_height=$(( (usable_height - GAP_SIZE) / 2 ))
-            local half_width_gap=$((GAP_SIZE + half_width + GAP_SIZE))
-            local half_height_gap=$((start_y + half_height + GAP_SIZE))
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[0]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $start_y,address:${win_array[0]}" > /dev/null 2>&1
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[1]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $half_width_gap $start_y,address:${win_array[1]}" > /dev/null 2>&1
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[2]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $half_height_gap,address:${win_array[2]}" > /dev/null 2>&1
-            
-            hyprctl dispatch resizewindowpixel "exact $half_width $half_height,address:${win_array[3]}" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $half_width_gap $half_height_gap,address:${win_array[3]}" > /dev/null 2>&1
-            ;;
-        *)
-            local cols=3
-            local rows=$(( (win_count + cols - 1) / cols ))
-            local win_width=$(( (usable_width - GAP_SIZE * (cols - 1)) / cols ))
-            local win_height=$(( (usable_height - GAP_SIZE * (rows - 1)) / rows ))
-            
-            for i in "${!win_array[@]}"; do
-                local col=$((i % cols))
-                local row=$((i / cols))
-                local x=$((GAP_SIZE + col * (win_width + GAP_SIZE)))
-                
-                if [ $row -eq 0 ]; then
-                    local y=$start_y
-                else
-                    local y=$((start_y + row * (win_height + GAP_SIZE)))
-                fi
-                
-                hyprctl dispatch resizewindowpixel "exact $win_width $win_height,address:${win_array[$i]}" > /dev/null 2>&1
-                hyprctl dispatch movewindowpixel "exact $x $y,address:${win_array[$i]}" > /dev/null 2>&1
-            done
-            ;;
-    esac
-}
+    def _page_review(self):
+        # Create scrolled window wrapper
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scroll.set_vexpand(True)
 
-HYPRLAND_INSTANCE_SIGNATURE="$HYPRLAND_INSTANCE_SIGNATURE"
-if [ -z "$HYPRLAND_INSTANCE_SIGNATURE" ]; then
-    HYPRLAND_INSTANCE_SIGNATURE=$(hyprctl instance -j 2>&1 | jq -r '.instanceSignature' 2>/dev/null || echo "")
-fi
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
+        box.set_margin_top(20)
+        box.set_margin_bottom(20)
+        box.set_margin_start(20)
+        box.set_margin_end(20)
 
-SEARCH_PATHS=("/tmp/hypr/" "$XDG_RUNTIME_DIR/hypr/")
-ACTUAL_SOCKET_PATH=""
-for PATH_TO_SEARCH in "${SEARCH_PATHS[@]}"; do
-    if [ -d "$PATH_TO_SEARCH" ]; then
-        FOUND_PATH=$(find "$PATH_TO_SEARCH" -type s -name ".socket2*" 2>/dev/null | head -n 1)
-        if [ -S "$FOUND_PATH" ]; then
-            ACTUAL_SOCKET_PATH="$FOUND_PATH"
-            break
-        fi
-    fi
-done
+        title = Gtk.Label(label="Review Configuration")
+        title.add_css_class("title-2")
+        box.append(title)
 
-if [ -S "$ACTUAL_SOCKET_PATH" ]; then
-    HYPRLAND_EVENT_SOCKET="$ACTUAL_SOCKET_PATH"
-else
-    HYPRLAND_EVENT_SOCKET="/tmp/hypr/$HYPRLAND_INSTANCE_SIGNATURE/.socket2"
-fi
+        self.review_label = Gtk.Label(label="")
+        self.review_label.set_wrap(True)
+        self.review_label.set_selectable(True)
+        self.review_label.set_halign(Gtk.Align.START)
+        box.append(self.review_label)
 
-get_window_geometry() {
-    local addr="$1"
-    hyprctl clients -j 2>/dev/null | jq -r ".[] | select(.address == \\"$addr\\") | \\"\\(.at[0]) \\(.at[1]) \\(.size[0]) \\(.size[1])\\""
-}
+        info_title = Gtk.Label(label="What will happen:")
+        info_title.add_css_class("title-3")
+        info_title.set_halign(Gtk.Align.START)
+        box.append(info_title)
 
-find_adjacent_window() {
-    local resize_addr="$1"
-    local ws_id="$2"
-    local edge="$3"  # "right" or "left"
-    
-    read -r rx ry rw rh <<< $(get_window_geometry "$resize_addr")
-    local best_match=""
-    local min_gap=99999
-    
-    while IFS= read -r addr; do
-        [[ "$addr" == "$resize_addr" || -z "$addr" ]] && continue
-        read -r wx wy ww wh <<< $(get_window_geometry "$addr")
-        
-        case "$edge" in
-            "right")
-                local resized_right=$((rx + rw))
-                local gap=$((wx - resized_right))
-                local resized_bottom=$((ry + rh))
-                local candidate_bottom=$((wy + wh))
-                
-                if [ $gap -ge -20 ] && [ $gap -le 50 ] && [ $wy -lt $resized_bottom ] && [ $candidate_bottom -gt $ry ]; then
-                    [ $gap -lt $min_gap ] && min_gap=$gap && best_match="$addr"
-                fi
-                ;;
-            "left")
-                local candidate_right=$((wx + ww))
-                local gap=$((rx - candidate_right))
-                local resized_bottom=$((ry + rh))
-                local candidate_bottom=$((wy + wh))
-                
-                if [ $gap -ge -20 ] && [ $gap -le 50 ] && [ $wy -lt $resized_bottom ] && [ $candidate_bottom -gt $ry ]; then
-                    [ $gap -lt $min_gap ] && min_gap=$gap && best_match="$addr"
-                fi
-                ;;
-        esac
-    done < <(hyprctl clients -j | jq -r ".[] | select(.workspace.id == $ws_id and .floating == true and (.title | test(\\"^mpv-workspace-video\\") | not)) | .address")
+        info = Gtk.Label()
+        info.set_wrap(True)
+        info.set_halign(Gtk.Align.START)
+
+        # Count video workspaces for dynamic info text
+        video_ws_count = sum(1 for path in self.ws_to_media.values() 
+                            if self.media_by_path[path].is_video)
+
+        info_parts = [
+            "• Helper scripts will be written to ~/.local/bin\n"
+            "• Configuration will be stored in ~/.config/hyprland-video-wallpapers\n"
+            "• Your hyprland.conf will be backed up and modified to source the new rules\n"
+        ]
+
+        if video_ws_count > 0:
+            info_parts.append(f"• 'togglefloating' will be disabled on {video_ws_count} video workspace(s), but enabled elsewhere\n")
+
+        info_parts.append("• Wallpaper processes (MPV, Hyprpaper) will be launched")
+
+        info.set_text("".join(info_parts))
+        box.append(info)
+
+        paths_title = Gtk.Label(label="Target paths:")
+        paths_title.add_css_class("title-3")
+        paths_title.set_halign(Gtk.Align.START)
+        box.append(paths_title)
+
+        paths = Gtk.Label()
+        paths.set_wrap(True)
+        paths.add_css_class("monospace")
+        paths.set_halign(Gtk.Align.START)
+        paths_text = (
+            f"Helper: {HELPER_SCRIPT}\n"
+            f"Config: {CONFIG_DIR}\n"
+            f"Rules: {RULES_DEST}\n"
+            f"Hyprpaper: {HYPRPAPER_CONF}"
+        )
+        paths.set_text(paths_text)
+        box.append(paths)
+
+        # Only show video workspace info if there are video workspaces
+        if video_ws_count > 0:
+            float_warning_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+            float_warning_box.add_css_class("info-box")
+            float_warning_box.set_margin_top(10)
+
+            float_title = Gtk.Label(label="ℹ️ Note on Video Wallpaper Workspaces")
+            float_title.add_css_class("title-3")
+            float_title.set_halign(Gtk.Align.START)
+            float_warning_box.append(float_title)
+
+            float_text = Gtk.Label(label=f"Video wallpapers use a 'pseudo-tiling' system where windows are floated. The 'togglefloating' keybind will be automatically disabled on the {video_ws_count} workspace(s) with video wallpapers, but will remain enabled on other workspaces (including image wallpaper workspaces).")
+            float_text.set_wrap(True)
+            float_text.set_halign(Gtk.Align.START)
+            float_warning_box.append(float_text)
+
+            box.append(float_warning_box)
+
+            warning_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+            warning_box.add_css_class("warning-box")
+            warning_box.set_margin_top(20)
+            warning_box.set_margin_bottom(20)
+
+            warning_title = Gtk.Label(label="⚠️ IMPORTANT: CLOSE ALL OPEN WINDOWS ⚠️")
+            warning_title.add_css_class("title-2")
+            warning_title.add_css_class("warning-text")
+            warning_box.append(warning_title)
+
+            warning_text = Gtk.Label(label="All currently open windows will be stuck under the wallpaper!\n\nCLOSE ALL WINDOWS BEFORE CLICKING 'Apply Installation' OR RELOADING HYPRLAND")
+            warning_text.set_wrap(True)
+            warning_text.add_css_class("warning-text")
+            warning_box.append(warning_text)
+
+            box.append(warning_box)
+
+        scroll.set_child(box)
+        self.review_page = scroll
+        return scroll
+
+    def _build_review(self, is_back_navigation=False):
+        self._page_review()
     
-    echo "$best_match"
-}
+        backend_str = ", ".join(self.backend_types).upper()
+        parts = []
+        if self.video_dir:
+            parts.append(f"🎥 Video Directory: {self.video_dir}\n")
+        if self.image_dir:
+            parts.append(f"🖼️ Image Directory: {self.image_dir}\n")
+        parts.append(f"🖥️ Workspaces to manage: {self.num_workspaces}\n")
+        parts.append(f"🎨 Backends: {backend_str}\n")
+        parts.append(f"📏 Window Gap: {self.gap_size}px\n")
+        parts.append(f"📐 Top Gap: {self.top_gap}px\n\n")
+        parts.append("Workspace Assignments:\n")
+
+        assigned_count = 0
+        sorted_assignments = sorted(self.ws_to_media.items())
+
+        for ws_id, media_path_str in sorted_assignments:
+            media = self.media_by_path[media_path_str]
+            media_title = media.title
+            media_type = "🎥" if media.is_video else "🖼️"
+            parts.append(f"  WS{ws_id}: {media_type} {media_title}\n")
+            assigned_count += 1
+
+        if assigned_count == 0:
+            parts.append("  ⚠️ No media assigned! (Installation will proceed but no wallpapers will start)\n")
+
+        self.review_label.set_text("".join(parts))
+        self._push_page("Review", self.review_page)
+
+    def _run_install_setup(self):
+        self._page_apply()
+        self._push_page("Installing", self.apply_page)
+        self._run_install_async() 
 
-cleanup() {
-    echo -e "\\nExiting script and closing all active video wallpapers..."
-    pkill -f "mpv --title=${MPV_WINDOW_CLASS}" || true 
-    exit 0
-}
-trap cleanup EXIT
+    def _page_apply(self):
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
+        box.set_margin_top(20)
+        box.set_margin_bottom(20)
+        box.set_margin_start(20)
+        box.set_margin_end(20)
 
-pkill -f "mpv --title=${MPV_WINDOW_CLASS}" || true 
+        title = Gtk.Label(label="Installing...")
+        title.add_css_class("title-2")
+        box.append(title)
 
-if [ "$TEMP_WORKSPACE_ID" -le 10 ]; then
-    echo "Moving existing windows to temporary Workspace $TEMP_WORKSPACE_ID..."
-    declare -A SAVED_WINDOWS
-    COUNT_MOVED=0
-    
-    while IFS='|' read -r address workspace_id; do
-        if [[ -n "$address" ]] && [[ "$workspace_id" =~ ^[0-9]+$ ]] && [ "$workspace_id" -ge 1 ] && [ "$workspace_id" -le "$NUM_WORKSPACES" ]; then
-            SAVED_WINDOWS["$address"]="$workspace_id"
-            hyprctl dispatch movetoworkspacesilent "$TEMP_WORKSPACE_ID,address:$address" > /dev/null 2>&1
-            COUNT_MOVED=$((COUNT_MOVED + 1))
-        fi
-    done < <(hyprctl clients -j | jq -r '.[] | select(.title | test("^mpv-workspace-video") | not and .workspace.id != -1) | "\\(.address)|\\(.workspace.id)"')
-    
-    echo "Saved and moved $COUNT_MOVED windows to temporary workspace $TEMP_WORKSPACE_ID."
-else
-    echo "Skipping window movement: TEMP_WORKSPACE_ID ($TEMP_WORKSPACE_ID) is outside range 1-10."
-fi
+        self.apply_log = Gtk.TextView()
+        self.apply_log.set_editable(False)
+        self.apply_log.set_monospace(True)
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_child(self.apply_log)
+        scroll.set_min_content_height(400)
+        box.append(scroll)
+        
+        self.apply_page = box
+        return box
 
-create_blank_image
-start_all_mpv
-init_hyprpaper_wallpapers
+    def _log(self, msg):
+        """Add message to log (Thread-safe)"""
+        self._queue_log("apply_log", msg)
 
-echo "Waiting for video wallpapers to initialize..."
-sleep 3
+    def _queue_log(self, view_attr, msg):
+        """Queue msg for the TextView stored in view_attr (thread-safe)
 
-if [ "$TEMP_WORKSPACE_ID" -le 10 ]; then
-    echo "Restoring windows from temporary workspace..."
-    for address in "${!SAVED_WINDOWS[@]}"; do
-        original_ws="${SAVED_WINDOWS[$address]}"
-        hyprctl dispatch movetoworkspacesilent "$original_ws,address:$address" > /dev/null 2>&1
-        echo "  ↳ Restored window $address to workspace $original_ws"
-    done
-fi
+        The first queued line schedules a flush; lines that arrive before it
+        runs are inserted with it, so a burst costs one insert and one scroll.
+        """
+        with self._log_lock:
+            pending = self._log_pending.setdefault(view_attr, [])
+            pending.append(msg)
+            if len(pending) > 1:
+                return
+        GLib.idle_add(self._flush_log, view_attr)
+
+    def _flush_log(self, view_attr):
+        """Insert every queued line for view_attr in one go"""
+        with self._log_lock:
+            msgs = self._log_pending.pop(view_attr, [])
+        view = getattr(self, view_attr, None)
+        if not view or not msgs:
+            return False
+        buf = view.get_buffer()
+        buf.insert(buf.get_end_iter(), "\n".join(msgs) + "\n")
+        view.scroll_to_mark(buf.get_insert(), 0.0, False, 0.0, 0.0)
+        return False
 
-sleep 1.0
+    def _run_install_async(self):
+        """Run installer in background thread"""
+        thread = Thread(target=self._run_install, daemon=True)
+        thread.start()
 
-echo "Applying window tiling..."
-for ws_id in $(echo "${SAVED_WINDOWS[@]}" | tr ' ' '\\n' | sort -u); do
-    if [[ "$ws_id" =~ ^[0-9]+$ ]]; then
-        sleep 0.2
-        pseudo_tile_workspace "$ws_id"
-    fi
-done
+    def _run_install(self):
+        """Execute full installation"""
+        try:
+            self._log("🛑 Stopping conflicting processes...")
+            kill_matching(("mpvpaper", "mpv --title=mpv-workspace-video", "hyprpaper"))
 
-if [[ $CURRENT_WORKSPACE ]]; then
-    manage_togglefloating "$CURRENT_WORKSPACE"
-fi
+            self._classify_media()
 
-CURRENT_WORKSPACE=$(hyprctl monitors -j 2>/dev/null | jq -r '.[] | select(.focused) | .activeWorkspace.id' 2>/dev/null)
+            if "mpv" in self.backend_types:
+                self._log("📝 Writing MPV helper script...")
+                self._write_helper_script()
 
-# Handle initial workspace (video or image)
-if [[ $CURRENT_WORKSPACE ]]; then
-    has_video=false
-    has_image=false
-    
-    # Check if this workspace has a video
-    for entry in "${VIDEO_MAP[@]}"; do
-        IFS=':' read -r ws_id video_path <<< "$entry"
-        if [ "$ws_id" == "$CURRENT_WORKSPACE" ]; then
-            send_mpv_command "$CURRENT_WORKSPACE" '{"command":["set_property","pause",false]}'
-            echo "Initial state: Video on Workspace $CURRENT_WORKSPACE is playing."
-            has_video=true
-            break
-        fi
-    done
-    
-    # Check if this workspace has an image (only if no video)
-    if [ "$has_video" = false ]; then
-        for entry in "${IMAGE_MAP[@]}"; do
-            IFS=':' read -r ws_id image_path <<< "$entry"
-            if [ "$ws_id" == "$CURRENT_WORKSPACE" ]; then
-                set_hyprpaper_wallpaper "$ws_id" "$image_path"
-                echo "Initial state: Image on Workspace $CURRENT_WORKSPACE is displayed."
-                has_image=true
-                break
-            fi
-        done
-    fi
-    
-    # Unload images if we're on a video workspace OR a workspace with no wallpaper
-    if [ "$has_video" = true ] || [ "$has_image" = false ]; then
-        unload_all_images
-    fi
-fi
+            if "hyprpaper" in self.backend_types:
+                self._log("📝 Configuring Hyprpaper...")
+                self._configure_hyprpaper()
 
-echo "Starting listener for Hyprland workspace events on $HYPRLAND_EVENT_SOCKET..."
+            self._log("📋 Writing Hyprland rules...")
+            self._write_rules_file()
 
-declare -A WORKSPACE_WINDOWS
-PREVIOUS_WORKSPACE=$CURRENT_WORKSPACE
+            self._log("⚙️ Configuring hyprland.conf...")
+            self._configure_hyprland()
 
-socat -u UNIX-CONNECT:"$HYPRLAND_EVENT_SOCKET" - | while IFS= read -r event; do
-    
-    if [[ $event == workspace* ]]; then
-        NEW_WORKSPACE=${event#workspace>>}
-        
-        if [[ "$NEW_WORKSPACE" =~ ^[0-9]+$ ]]; then
-            has_video=false
-            has_image=false
-            
-            # Step 1: Handle ALL video pause/play logic FIRST (complete the entire loop)
-            for entry in "${VIDEO_MAP[@]}"; do
-                IFS=':' read -r ws_id video_path <<< "$entry"
-                
-                if [ "$ws_id" == "$NEW_WORKSPACE" ]; then
-                    send_mpv_command "$ws_id" '{"command":["set_property","pause",false]}'
-                    has_video=true
-                else
-                    send_mpv_command "$ws_id" '{"command":["set_property","pause",true]}'
-                fi
-            done
-            
-            # Step 2: Now handle images based on what workspace we're on
-            if [ "$has_video" = false ]; then
-                # Not a video workspace, check for images
-                for entry in "${IMAGE_MAP[@]}"; do
-                    IFS=':' read -r ws_id image_path <<< "$entry"
-                    if [ "$ws_id" == "$NEW_WORKSPACE" ]; then
-                        # This workspace has an image
-                        set_hyprpaper_wallpaper "$ws_id" "$image_path"
-                        has_image=true
-                        break
-                    fi
-                done
-            fi
-            
-            # Step 3: Unload images if we're on a video workspace OR a workspace with no image
-            if [ "$has_video" = true ] || [ "$has_image" = false ]; then
-                unload_all_images
-            fi
-            
-            # Step 4: Manage togglefloating based on workspace type
-            manage_togglefloating "$NEW_WORKSPACE"
+            self._log("🚫 Disabling togglefloating...")
+            self._disable_togglefloating()
 
-            PREVIOUS_WORKSPACE=$NEW_WORKSPACE
-        fi
-    fi
-    
-    if [[ $event == openwindow* ]]; then
-        NEW_WINDOW_ADDR=$(echo "$event" | cut -d'>' -f3 | cut -d',' -f1)
-        
-        sleep 0.3
-        
-        CURRENT_WS=$(hyprctl monitors -j 2>/dev/null | jq -r '.[] | select(.focused) | .activeWorkspace.id' 2>/dev/null)
-        
-        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
-            monitor_info=$(hyprctl monitors -j | jq -r '.[] | select(.focused) | "\(.width) \(.height)"')
-            read -r SCREEN_WIDTH SCREEN_HEIGHT <<< "$monitor_info"
+            self._log("💾 Writing configuration...")
+            self._write_config_file()
+
+            self._log("✅ Installation complete! Starting wallpapers...")
             
-            default_width=$((SCREEN_WIDTH - GAP_SIZE * 2))
-            default_height=$((SCREEN_HEIGHT - TOP_GAP - GAP_SIZE))
+            self._start_wallpapers_silent()
             
-            hyprctl dispatch resizewindowpixel "exact $default_width $default_height,address:$NEW_WINDOW_ADDR" > /dev/null 2>&1
-            hyprctl dispatch movewindowpixel "exact $GAP_SIZE $((GAP_SIZE + TOP_GAP)),address:$NEW_WINDOW_ADDR" > /dev/null 2>&1
+            self._log("⏳ Waiting for wallpapers to initialize...")
+            self._wait_for_wallpapers()
             
-            sleep 0.3
-            pseudo_tile_workspace "$CURRENT_WS"
-        fi
-    fi
-    
-    if [[ $event == closewindow* ]]; then
-        CURRENT_WS=$(hyprctl monitors -j 2>/dev/null | jq -r '.[] | select(.focused) | .activeWorkspace.id' 2>/dev/null)
-        
-        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
-            sleep 0.1
-            pseudo_tile_workspace "$CURRENT_WS"
-        fi
-    fi
-if [[ $event == resizewindow* ]]; then
-        RESIZE_ADDR=$(echo "$event" | cut -d'>' -f2 | cut -d',' -f1)
-        
-        CURRENT_WS=$(hyprctl monitors -j 2>/dev/null | jq -r '.[] | select(.focused) | .activeWorkspace.id' 2>/dev/null)
-        
-        if [[ "$CURRENT_WS" =~ ^[0-9]+$ ]]; then
-            read -r rx ry rw rh <<< $(get_window_geometry "$RESIZE_ADDR")
+            self._log("✅ Wallpapers started! Pushing summary page...")
             
-            # Find and resize adjacent windows
-            right_window=$(find_adjacent_window "$RESIZE_ADDR" "$CURRENT_WS" "right")
-            if [[ -n "$right_window" ]]; then
-                read -r wx wy ww wh <<< $(get_window_geometry "$right_window")
-                local resized_right=$((rx + rw))
-                local new_width=$((wx + ww - resized_right - GAP_SIZE))
-                
-                if [ $new_width -gt 100 ]; then
-                    hyprctl dispatch resizewindowpixel "exact $new_width $wh,address:$right_window" > /dev/null 2>&1
-                    hyprctl dispatch movewindowpixel "exact $((resized_right + GAP_SIZE)) $wy,address:$right_window" > /dev/null 2>&1
-                fi
-            fi
+            def show_summary_and_close():
+                self._push_page("Summary", self._page_summary())
+                GLib.timeout_add(3000, self._close_app)
             
-            left_window=$(find_adjacent_window "$RESIZE_ADDR" "$CURRENT_WS" "left")
-            if [[ -n "$left_window" ]]; then
-                read -r wx wy ww wh <<< $(get_window_geometry "$left_window")
-                local new_width=$((rx - wx - GAP_SIZE))
-                
-                if [ $new_width -gt 100 ]; then
-                    hyprctl dispatch resizewindowpixel "exact $new_width $wh,address:$left_window" > /dev/null 2>&1
-                fi
-            fi
-        fi
-    fi
-done
-'''
+            GLib.idle_add(show_summary_and_close)
+            
+        except Exception as e:
+            logger.error("Error during installation: %s", e, exc_info=True)
+            self._log(f"❌ FATAL ERROR during installation: {e}")
+            self._log("Please check the log file for details.")
+
+    def _classify_media(self):
+        """Split the assigned workspaces into sorted video/image ID lists
+        in one pass; every writer of the install reuses the result"""
+        self._video_ws = []
+        self._image_ws = []
+        for ws_id, path in sorted(self.ws_to_media.items()):
+            ext = media_ext(path)
+            if ext in VIDEO_EXTS:
+                self._video_ws.append(ws_id)
+            elif ext in IMAGE_EXTS:
+                self._image_ws.append(ws_id)
+
+    def _wait_for_wallpapers(self, timeout=10):
+        """Block until every video workspace's mpv IPC socket is listening"""
+        sockets = [f"/tmp/mpv-ws-{ws}-ipc" for ws in self._video_ws]
+        if not wait_for_sockets(sockets, timeout):
+            logger.warning("mpv IPC sockets not ready after %ss", timeout)
+
+    def _close_app(self):
+        """Helper function to close the window."""
+        logger.info("Auto-closing application after successful install.")
+        if self.get_application():
+            self.get_application().quit()
+        else:
+            self.close()
+        return False
+
+    def _write_helper_script(self):
+        """Write the main MPV helper script with improved Hyprpaper IPC control."""
+        HELPER_SCRIPT.parent.mkdir(parents=True, exist_ok=True)
         
-        HELPER_SCRIPT.write_text(content)
-        HELPER_SCRIPT.chmod(0o755)
+        atomic_write_text(HELPER_SCRIPT, HELPER_SCRIPT_CONTENT, mode=0o755)
 
     def _configure_hyprpaper(self):
         """Configure hyprpaper for image wallpapers"""
         HYPRPAPER_CONF.parent.mkdir(parents=True, exist_ok=True)
 
         if HYPRPAPER_CONF.exists():
-            backup_hyprpaper = HYPRPAPER_CONF.parent / "hyprpaper.conf.motion.bak"
-            shutil.copy2(HYPRPAPER_CONF, backup_hyprpaper)
-            self.hyprpaper_backup_path = str(backup_hyprpaper)
-            self._log(f"Backed up hyprpaper.conf to {backup_hyprpaper.name}")
+            copy_file(HYPRPAPER_CONF, HYPRPAPER_CONF_BACKUP)
+            self.hyprpaper_backup_path = str(HYPRPAPER_CONF_BACKUP)
+            self._log(f"Backed up hyprpaper.conf to {HYPRPAPER_CONF_BACKUP.name}")
         
         config_lines = []
         config_lines.append("# Generated by Hyprland Video Wallpapers")
@@ -1721,22 +2486,20 @@ done
         # We don't preload here anymore - the helper script handles it dynamically
         config_lines.append("# Wallpapers are managed dynamically via IPC")
         
-        HYPRPAPER_CONF.write_text("\n".join(config_lines))
+        atomic_write_text(HYPRPAPER_CONF, "\n".join(config_lines))
 
     def _write_rules_file(self):
         """Write Hyprland rules"""
         RULES_DEST_DIR.mkdir(parents=True, exist_ok=True)
 
+        parts = ["# Hyprland Video Wallpapers Configuration\n"]
+
         # Only apply master layout to workspaces with video wallpapers
-        workspace_rules = "\n# Workspaces with video wallpapers using Master layout\n"
-        video_workspaces = set()
-        for ws_id, media_path in self.ws_to_media.items():
-            if Path(media_path).suffix.lower() in VIDEO_EXTS:
-                video_workspaces.add(ws_id)
-                workspace_rules += f"workspace = {ws_id}, layout:master\n"
+        parts.append("\n# Workspaces with video wallpapers using Master layout\n")
+        parts.extend(f"workspace = {ws_id}, layout:master\n" for ws_id in self._video_ws)
 
-        if video_workspaces:
-            static_rules = f"""
+        if self._video_ws:
+            parts.append(f"""
 
 # Master layout settings (only for video workspaces)
 master {{
@@ -1755,15 +2518,12 @@ windowrulev2 = noinitialfocus, title:^(mpv-workspace-video-.*)$
 windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
 
 # Make windows float only on video workspaces
-"""
-            for ws_id in sorted(video_workspaces):
-                static_rules += f"windowrulev2 = float, workspace:{ws_id}\n"
+""")
+            parts.extend(f"windowrulev2 = float, workspace:{ws_id}\n" for ws_id in self._video_ws)
         else:
-            static_rules = "\n# No video workspaces configured\n"
+            parts.append("\n# No video workspaces configured\n")
 
-        content = f"# Hyprland Video Wallpapers Configuration\n{workspace_rules}{static_rules}"
-
-        RULES_DEST.write_text(content)
+        atomic_write_text(RULES_DEST, "".join(parts))
 
     def _configure_hyprland(self):
         """Configure hyprland.conf"""
@@ -1772,41 +2532,29 @@ windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
             HYPR_CONF.parent.mkdir(parents=True, exist_ok=True)
             HYPR_CONF.touch()
 
-        backup_path = HYPR_CONF.parent / "hyprland.conf.motion.bak"
-        shutil.copy2(HYPR_CONF, backup_path)
-        self.backup_conf_path = str(backup_path)
+        copy_file(HYPR_CONF, HYPR_CONF_BACKUP)
+        self.backup_conf_path = str(HYPR_CONF_BACKUP)
         self._log(f"✅ Created backup: {self.backup_conf_path}")
 
         conf_text = HYPR_CONF.read_text()
 
-        if "hyprland-video-wallpapers" in conf_text:
-            self._log("ℹ️ Config already present, removing old entries...")
-            lines = conf_text.split('\n')
-            new_lines = []
-            skip_next = False
-            for line in lines:
-                if "hyprland-video-wallpapers" in line:
-                    skip_next = True
-                    continue
-                if skip_next and (line.strip().startswith("source =") or line.strip().startswith("exec-once =")):
-                    continue
-                skip_next = False
-                new_lines.append(line)
-            conf_text = '\n'.join(new_lines)
-
-        togglefloat_conf = CONFIG_DIR / "togglefloating.conf"
+        # One regex pass drops old entries without splitting into lines
+        conf_text, removed = HYPR_CONF_ENTRY_RE.subn("", conf_text)
+        if removed:
+            self._log("ℹ️ Config already present, removed old entries")
 
-        conf_text += f"\n\n# Added by Hyprland Video Wallpapers Installer\n"
-        conf_text += f"source = {RULES_DEST}\n"
-        conf_text += f"source = {togglefloat_conf}\n"
+        parts = [conf_text,
+                 f"\n\n# {INSTALLER_MARKER}\n",
+                 f"source = {RULES_DEST}\n",
+                 f"source = {TOGGLEFLOAT_CONF}\n"]
 
         if "mpv" in self.backend_types:
-            conf_text += f"exec-once = {HELPER_SCRIPT}\n"
+            parts.append(f"exec-once = {HELPER_SCRIPT}\n")
 
         if "hyprpaper" in self.backend_types:
-            conf_text += f"exec-once = hyprpaper\n"
+            parts.append("exec-once = hyprpaper\n")
 
-        HYPR_CONF.write_text(conf_text)
+        atomic_write_text(HYPR_CONF, "".join(parts))
         self._log("✅ hyprland.conf updated.")
 
     def _disable_togglefloating(self):
@@ -1814,8 +2562,7 @@ windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
         hypr_dir = HYPR_CONF.parent
 
         # Create a togglefloating management file
-        togglefloat_conf = CONFIG_DIR / "togglefloating.conf"
-        togglefloat_conf.write_text("# Togglefloating dynamically managed by wallpaper script\n")
+        atomic_write_text(TOGGLEFLOAT_CONF, "# Togglefloating dynamically managed by wallpaper script\n")
 
         # Find and backup original togglefloating binds
         togglefloat_binds = []
@@ -1835,7 +2582,7 @@ windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
                 # Comment out togglefloating in original files
                 backup = Path(str(conf_file) + ".toggle.bak")
                 if not backup.exists():
-                    shutil.copy2(conf_file, backup)
+                    copy_file(conf_file, backup)
 
                     new_lines = []
                     modified = False
@@ -1847,13 +2594,13 @@ windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
                             new_lines.append(line)
 
                     if modified:
-                        conf_file.write_text('\n'.join(new_lines))
+                        atomic_write_text(conf_file, '\n'.join(new_lines))
                         self._log(f"ℹ️ Disabled togglefloating in {conf_file.name} (backup created)")
 
         # Save the original binds to config for restoration
         if togglefloat_binds:
             config_file = CONFIG_DIR / "togglefloating_binds.txt"
-            config_file.write_text('\n'.join(togglefloat_binds))
+            atomic_write_text(config_file, '\n'.join(togglefloat_binds))
             self._log(f"💾 Saved {len(togglefloat_binds)} togglefloating bind(s) for dynamic management")
 
     def _write_config_file(self):
@@ -1871,7 +2618,7 @@ windowrulev2 = suppressevent fullscreen, title:^(mpv-workspace-video-.*)$
         if not self.backup_conf_path:
             self.backup_conf_path = ""
         
-        content = f"""# Configuration generated by Hyprland Video Wallpapers GUI on {time.strftime('%Y-%m-%d %H:%M:%S')}
+        parts = [f"""# Configuration generated by Hyprland Video Wallpapers GUI on {time.strftime('%Y-%m-%d %H:%M:%S')}
 
 NUM_WORKSPACES={self.num_workspaces}
 TEMP_WORKSPACE_ID={temp_ws_id}
@@ -1881,25 +2628,19 @@ BACKUP_CONF_PATH="{self.backup_conf_path}"
 BACKUP_HYPRPAPER_PATH="{getattr(self, 'hyprpaper_backup_path', '')}"
 BACKENDS="{','.join(self.backend_types)}"
 
-# Video map: (Workspace_ID:Video_Path)
-VIDEO_MAP=(
-"""
-        
-        sorted_assignments = sorted(self.ws_to_media.items())
-        for ws_id, media_path_str in sorted_assignments:
-            if Path(media_path_str).suffix.lower() in VIDEO_EXTS:
-                content += f'    "{ws_id}:{media_path_str}"\n'
+# Video map: [Workspace_ID]=Video_Path
+declare -A VIDEO_MAP=(
+"""]
         
-        content += ")\n"
+        parts.extend(f'    [{ws_id}]="{self.ws_to_media[ws_id]}"\n' for ws_id in self._video_ws)
+        parts.append(")\n")
         
-        content += "\n# Image map: (Workspace_ID:Image_Path)\n"
-        content += "IMAGE_MAP=(\n"
-        for ws_id, media_path_str in sorted_assignments:
-            if Path(media_path_str).suffix.lower() in IMAGE_EXTS:
-                content += f'    "{ws_id}:{media_path_str}"\n'
-        content += ")\n"
+        parts.append("\n# Image map: [Workspace_ID]=Image_Path\n")
+        parts.append("declare -A IMAGE_MAP=(\n")
+        parts.extend(f'    [{ws_id}]="{self.ws_to_media[ws_id]}"\n' for ws_id in self._image_ws)
+        parts.append(")\n")
         
-        config_path.write_text(content)
+        atomic_write_text(config_path, "".join(parts))
         self._log(f"✅ Config written with backup path: {self.backup_conf_path}")
 
     def _page_uninstall(self):
@@ -1968,21 +2709,15 @@ VIDEO_MAP=(
 
     def _uninstall_log(self, msg):
         """Add message to uninstall log (Thread-safe)"""
-        def do_log():
-            if not self.uninstall_log or not self.uninstall_log.get_buffer():
-                return
-            buf = self.uninstall_log.get_buffer()
-            buf.insert(buf.get_end_iter(), msg + "\n")
-            insert_mark = buf.get_insert()
-            self.uninstall_log.scroll_to_mark(insert_mark, 0.0, False, 0.0, 0.0)
-            
-        GLib.idle_add(do_log)
+        self._queue_log("uninstall_log", msg)
         
     def _run_uninstall(self):
         """Execute uninstallation"""
         self._uninstall_log("🛑 Stopping wallpaper processes...")
-        run(["pkill", "-f", "mpv --title=mpv-workspace-video"])
-        run(["pkill", "-f", "hyprpaper"])
+        # One /proc pass for every pattern; the helper script goes too so it
+        # cannot respawn anything mid-uninstall
+        kill_matching(("mpv --title=mpv-workspace-video", "hyprpaper",
+                       ".local/bin/hyprland-video-wallpapers.sh"))
 
         backup_to_restore = None
         hyprpaper_backup = None
@@ -1990,14 +2725,13 @@ VIDEO_MAP=(
         if config_file.exists():
             self._uninstall_log(f"ℹ️ Reading config file: {config_file}")
             try:
-                config_text = config_file.read_text()
-                for line in config_text.split('\n'):
-                    if line.startswith("BACKUP_CONF_PATH="):
-                        backup_to_restore = line.split('=')[1].strip().strip('"')
-                        self._uninstall_log(f"Found hyprland backup path: {backup_to_restore}")
-                    elif line.startswith("BACKUP_HYPRPAPER_PATH="):
-                        hyprpaper_backup = line.split('=')[1].strip().strip('"')
-                        self._uninstall_log(f"Found hyprpaper backup path: {hyprpaper_backup}")
+                backups = dict(CONFIG_BACKUP_RE.findall(config_file.read_text()))
+                backup_to_restore = backups.get("BACKUP_CONF_PATH") or None
+                hyprpaper_backup = backups.get("BACKUP_HYPRPAPER_PATH") or None
+                if backup_to_restore:
+                    self._uninstall_log(f"Found hyprland backup path: {backup_to_restore}")
+                if hyprpaper_backup:
+                    self._uninstall_log(f"Found hyprpaper backup path: {hyprpaper_backup}")
             except Exception as e:
                 self._uninstall_log(f"⚠️ Could not read backup paths from config: {e}")
 
@@ -2011,12 +2745,16 @@ VIDEO_MAP=(
 
         self._uninstall_log("🗑️ Cleaning up MPV socket files...")
         try:
-            for socket_file in Path("/tmp").glob("mpv-ws*"):
-                try:
-                    socket_file.unlink()
-                    self._uninstall_log(f"Removed socket: {socket_file}")
-                except Exception as e:
-                    self._uninstall_log(f"⚠️ Failed to remove {socket_file}: {e}")
+            # Match on the dirent name; only the sockets ever become paths
+            with os.scandir("/tmp") as it:
+                for entry in it:
+                    if not entry.name.startswith("mpv-ws"):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        self._uninstall_log(f"Removed socket: {entry.path}")
+                    except Exception as e:
+                        self._uninstall_log(f"⚠️ Failed to remove {entry.path}: {e}")
         except Exception as e:
             self._uninstall_log(f"⚠️ Error during socket cleanup: {e}")
 
@@ -2041,7 +2779,7 @@ VIDEO_MAP=(
         # Try to restore from tracked backup
         if hyprpaper_backup and Path(hyprpaper_backup).exists():
             try:
-                shutil.copy2(hyprpaper_backup, HYPRPAPER_CONF)
+                copy_file(hyprpaper_backup, HYPRPAPER_CONF)
                 Path(hyprpaper_backup).unlink()
                 self._uninstall_log(f"✅ Restored hyprpaper.conf from backup and deleted backup")
             except Exception as e:
@@ -2056,7 +2794,7 @@ VIDEO_MAP=(
         # Clean up hyprpaper motion backup file
         self._uninstall_log("🧹 Cleaning up hyprpaper backup file...")
         try:
-            motion_backup = HYPR_CONF.parent / "hyprpaper.conf.motion.bak"
+            motion_backup = HYPRPAPER_CONF_BACKUP
             if motion_backup.exists():
                 motion_backup.unlink()
                 self._uninstall_log(f"✅ Removed hyprpaper.conf.motion.bak")
@@ -2077,7 +2815,7 @@ VIDEO_MAP=(
             if backup_path.exists():
                 try:
                     self._uninstall_log(f"Found backup file, restoring...")
-                    shutil.copy2(backup_path, HYPR_CONF)
+                    copy_file(backup_path, HYPR_CONF)
                     self._uninstall_log(f"✅ Restored hyprland.conf from {backup_path.name}")
 
                     # Delete the backup file after successful restore
@@ -2098,12 +2836,12 @@ VIDEO_MAP=(
         # Fallback: try to find and restore the motion backup
         if not restored:
             self._uninstall_log("Attempting to restore from motion backup...")
-            motion_backup = HYPR_CONF.parent / "hyprland.conf.motion.bak"
+            motion_backup = HYPR_CONF_BACKUP
 
             if motion_backup.exists():
                 try:
                     self._uninstall_log(f"Found motion backup")
-                    shutil.copy2(motion_backup, HYPR_CONF)
+                    copy_file(motion_backup, HYPR_CONF)
                     motion_backup.unlink()
                     self._uninstall_log(f"✅ Restored hyprland.conf from motion backup and deleted backup")
                     restored = True
@@ -2124,14 +2862,14 @@ VIDEO_MAP=(
 
                     for line in lines:
                         # Check if this is the start marker
-                        if "Added by Hyprland Video Wallpapers Installer" in line:
+                        if INSTALLER_MARKER in line:
                             in_installer_section = True
                             continue  # Skip the marker line itself
                         
                         # Check if we're still in the installer section
                         if in_installer_section:
                             # Check if this is the end marker (another occurrence)
-                            if "Added by Hyprland Video Wallpapers Installer" in line:
+                            if INSTALLER_MARKER in line:
                                 in_installer_section = False
                                 continue  # Skip the end marker too
                             # Skip all lines in the section
@@ -2140,7 +2878,7 @@ VIDEO_MAP=(
                         # Keep lines outside the installer section
                         new_lines.append(line)
 
-                    HYPR_CONF.write_text('\n'.join(new_lines))
+                    atomic_write_text(HYPR_CONF, '\n'.join(new_lines))
                     self._uninstall_log("✅ Manually removed installer lines from hyprland.conf")
                     restored = True
             except Exception as e:
@@ -2151,14 +2889,15 @@ VIDEO_MAP=(
             self._uninstall_log("You may need to manually restore from a backup or reconfigure.")
 
         self._uninstall_log("♻️ Restoring togglefloating entries...")
-        for toggle_bak in HYPR_CONF.parent.glob("*.conf.toggle.bak"):
+        with os.scandir(HYPR_CONF.parent) as it:
+            toggle_baks = [e for e in it if e.name.endswith(".conf.toggle.bak")]
+        for toggle_bak in toggle_baks:
             try:
-                orig_file_str = str(toggle_bak).removesuffix(".toggle.bak")
-                orig_file = Path(orig_file_str)
+                orig_file = toggle_bak.path.removesuffix(".toggle.bak")
 
-                self._uninstall_log(f"Restoring {orig_file.name} from {toggle_bak.name}")
-                shutil.copy2(toggle_bak, orig_file)
-                toggle_bak.unlink()
+                self._uninstall_log(f"Restoring {os.path.basename(orig_file)} from {toggle_bak.name}")
+                copy_file(toggle_bak.path, orig_file)
+                os.unlink(toggle_bak.path)
             except Exception as e:
                 self._uninstall_log(f"⚠️ Failed to restore {toggle_bak.name}: {e}")
 
@@ -2205,56 +2944,42 @@ VIDEO_MAP=(
         """Reset state and return to welcome page"""
         # Reset state
         self.ws_to_media = {}
+        self.media_to_ws = {}
         self.selected_workspaces = set()
         self.backend_types = ["mpv"]
         self.backup_conf_path = None
         self.hyprpaper_backup_path = None
         self.video_dir = None
         self.image_dir = None
-        self.media_items = []
+        self.media_by_path = {}
+        self._scan_generation += 1
         self.num_workspaces = 5
         self.gap_size = 15
         self.top_gap = 30
         
         # Create new log file for the new session
-        global LOG_FILE, LOG_DIR, logger
+        global LOG_FILE
         
         # Ensure log directory exists (uninstaller may have deleted it)
         LOG_DIR.mkdir(parents=True, exist_ok=True)
-        LOG_FILE = LOG_DIR / f"gui_debug_{int(time.time())}.log"
+        if os.environ.get("HVW_KEEP_LOGS"):
+            LOG_FILE = LOG_DIR / f"gui_debug_{int(time.time())}.log"
         
-        # Remove old handlers
-        for handler in logger.handlers[:]:
+        # Swap the handlers basicConfig installed for fresh ones
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
             handler.close()
-            logger.removeHandler(handler)
-        
-        # Add new handlers with new log file
-        logger.addHandler(logging.FileHandler(LOG_FILE))
-        logger.addHandler(logging.StreamHandler(sys.stdout))
+            root.removeHandler(handler)
+        for handler in _make_log_handlers():
+            root.addHandler(handler)
         
         logger.info("=" * 80)
         logger.info("Hyprland Video Wallpapers GUI Restarted")
-        logger.info(f"New log file: {LOG_FILE}")
+        logger.info("New log file: %s", LOG_FILE)
         logger.info("=" * 80)
         
         # Kill any lingering processes
-        try:
-            subprocess.run(["pkill", "-f", "mpv"], 
-                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)
-            subprocess.run(["pkill", "-f", "hyprpaper"], 
-                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)
-            subprocess.run(["pkill", "-f", ".local/bin/hyprland-video-wallpapers.sh"], 
-                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(0.5)
-            
-            # Clean up socket files
-            for socket_file in Path("/tmp").glob("mpv-ws*"):
-                socket_file.unlink()
-            logger.info("Cleared old processes and sockets")
-        except Exception as e:
-            logger.warning(f"Could not clear processes/sockets: {e}")
+        self._clear_old_processes()
         
         self._push_page("Welcome", self.welcome_page)
         
@@ -2290,24 +3015,17 @@ VIDEO_MAP=(
         """Start wallpapers silently in background"""
         try:
             self._log("Ensuring old processes are stopped...")
-            run(["pkill", "-f", "mpv --title=mpv-workspace-video"])
-            time.sleep(1)
+            # Wait only as long as a straggler actually takes to exit
+            if kill_matching(("mpv --title=mpv-workspace-video",)):
+                wait_for_exit({"mpv"}, timeout=1)
             
             if "mpv" in self.backend_types and HELPER_SCRIPT.exists():
                 self._log(f"Starting MPV helper: {HELPER_SCRIPT}")
-                command = f'nohup {HELPER_SCRIPT} > /dev/null 2>&1 &'
-                subprocess.Popen(command, 
-                               shell=True,
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL,
-                               close_fds=True)
+                spawn_daemon([str(HELPER_SCRIPT)])
             
             if "hyprpaper" in self.backend_types:
                 self._log("Starting Hyprpaper...")
-                subprocess.Popen(["hyprpaper"],
-                               stdout=subprocess.DEVNULL,
-                               stderr=subprocess.DEVNULL,
-                               close_fds=True)
+                spawn_daemon(["hyprpaper"])
                 
         except Exception as e:
             self._log(f"❌ Error: Failed to start wallpapers: {e}")
@@ -2316,23 +3034,22 @@ VIDEO_MAP=(
         """Check if all required tools are present."""
         logger.info("Running prerequisite check...")
         tools = ["ffmpeg", "ffprobe", "mpv", "socat", "jq", "hyprctl", "hyprpaper"]
-        all_found = True
+        missing = missing_executables(tools)
         for t in tools:
-            if shutil.which(t) is None:
-                logger.warning(f"✗ Prerequisite missing: {t}")
-                all_found = False
+            if t in missing:
+                logger.warning("✗ Prerequisite missing: %s", t)
             else:
-                logger.info(f"✓ Prerequisite found: {t}")
-        return all_found
+                logger.info("✓ Prerequisite found: %s", t)
+        return not missing
 
     def _perform_prereq_check_and_proceed(self):
         """Run prereq check and navigate to the correct first page."""
         if self._check_prerequisites():
             logger.info("✓ All prerequisites found. Skipping prereq page.")
-            self._push_page("Video Source", self.video_source_page)
+            self._push_page("Video Source")
         else:
             logger.warning("✗ Missing prerequisites. Showing prereq page.")
-            self._push_page("Prerequisites", self.prereq_page)
+            self._push_page("Prerequisites")
 
     def _start_install(self):
         """Start installation flow"""
@@ -2342,49 +3059,21 @@ VIDEO_MAP=(
 
     def _apply_css(self):
         """Apply custom CSS styling"""
-        css = b"""
-        .title-1 { font-size: 32px; font-weight: 700; margin: 12px; }
-        .title-2 { font-size: 24px; font-weight: 600; margin: 8px; }
-        .title-3 { font-size: 18px; font-weight: 600; }
-        .subtitle { font-size: 14px; opacity: 0.8; margin: 4px; }
-        .thumbnail { border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.4); }
-        .thumbnail:hover { transform: scale(1.03); }
-        .thumbnail-card { padding: 8px; border-radius: 8px; background: alpha(@theme_bg_color, 0.5); }
-        .thumbnail-card:hover { background: alpha(@theme_bg_color, 0.8); }
-        .status-found { color: #26a269; }
-        .status-missing { color: #e01b24; }
-        .warning { color: #f57707; font-weight: 500; }
-        .warning-box { 
-            padding: 20px; 
-            background: alpha(@error_bg_color, 0.3); 
-            border: 3px solid @error_color; 
-            border-radius: 12px; 
-        }
-        .warning-text { 
-            color: @error_color; 
-            font-weight: 700; 
-            font-size: 16px;
-        }
-        .info-box { 
-            padding: 12px; 
-            background: alpha(@theme_selected_bg_color, 0.3); 
-            border: 1px solid @theme_selected_bg_color; 
-            border-radius: 8px; 
-        }
-        .monospace { font-family: monospace; font-size: 11px; opacity: 0.8; }
-        """
+        global _CSS_PROVIDER
+        if _CSS_PROVIDER is not None:
+            return
         
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
+        _CSS_PROVIDER = Gtk.CssProvider()
+        _CSS_PROVIDER.load_from_data(APP_CSS)
         Gtk.StyleContext.add_provider_for_display(
             Gdk.Display.get_default(),
-            provider,
+            _CSS_PROVIDER,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
 
 class App:
     def __init__(self):
-        logger.info(f"App.__init__ called")
+        logger.info("App.__init__ called")
         self.window = None
         logger.info("✓ App initialized")
 
@@ -2393,52 +3082,58 @@ class App:
         try:
             self.window = MainWindow(None)
             logger.info("✓ MainWindow created")
-            self.window._apply_css()
-            logger.info("✓ CSS applied")
-            
-            # Set window as floating via Hyprland
-            try:
-                window_address = None
-                time.sleep(0.5)
-                
-                # Get all windows and find ours by title
-                stdout, _ = run(["hyprctl", "clients", "-j"])
-                if stdout:
-                    import json
-                    clients = json.loads(stdout)
-                    for client in clients:
-                        if "Hyprland Video Wallpaper" in client.get("title", ""):
-                            window_address = client.get("address", "")
-                            break
-                
-                if window_address:
-                    # Force the window to float
-                    run(["hyprctl", "dispatch", "togglefloating", f"address:{window_address}"])
-                    logger.info(f"✓ Window set to floating: {window_address}")
-            except Exception as e:
-                logger.warning(f"Could not set window floating via hyprctl: {e}")
             
+            # Float it as soon as it is mapped rather than after a guessed delay
+            self._map_handler = self.window.connect("map", self._on_window_mapped)
             self.window.present()
             logger.info("✓ Window presented")
             return self.window
         except Exception as e:
-            logger.error(f"Error creating window: {e}", exc_info=True)
+            logger.error("Error creating window: %s", e, exc_info=True)
             raise
 
+    def _on_window_mapped(self, window):
+        window.disconnect(self._map_handler)
+        # GTK maps before its first frame reaches Hyprland, so retry briefly
+        # until the compositor lists the window
+        self._float_tries = 20
+        if self._float_window():
+            GLib.timeout_add(25, self._float_window)
+
+    def _float_window(self):
+        """Set window as floating via Hyprland; True while still waiting for it"""
+        try:
+            window_address = None
+            
+            # We were just presented, so we are normally the focused window;
+            # only scan every client if focus already moved elsewhere
+            stdout = hypr_ipc("j/activewindow")
+            active = json.loads(stdout) if stdout else {}
+            if "Hyprland Video Wallpaper" in active.get("title", ""):
+                window_address = active.get("address", "")
+            else:
+                for client in json.loads(hypr_ipc("j/clients") or "[]"):
+                    if "Hyprland Video Wallpaper" in client.get("title", ""):
+                        window_address = client.get("address", "")
+                        break
+            
+            if window_address:
+                # Force the window to float
+                hypr_ipc(f"dispatch togglefloating address:{window_address}")
+                logger.info("✓ Window set to floating: %s", window_address)
+                return False
+        except Exception as e:
+            logger.warning("Could not set window floating via hyprctl: %s", e)
+            return False
+        self._float_tries -= 1
+        return self._float_tries > 0
+
 if __name__ == '__main__':
-    logger.info("Starting application...")
+    # Created before anything can fail so the error dialog can run on it too
+    main_loop = GLib.MainLoop()
     try:
-        logger.info("Creating App instance...")
         app = App()
-        logger.info("✓ App object created")
-        
-        logger.info("Creating main loop...")
-        main_loop = GLib.MainLoop()
-        logger.info(f"Main loop created: {main_loop}")
-        
-        logger.info("Creating window...")
         window = app.create_window()
-        logger.info("✓ Window created and shown")
         
         def on_window_close(*args):
             logger.info("Window closed, exiting main loop...")
@@ -2446,9 +3141,10 @@ if __name__ == '__main__':
             return False
         
         window.connect('close-request', on_window_close)
-        logger.info("Close signal connected")
         
-        logger.info("Running main loop...")
+        # One record for the whole sequence; a failure above is logged with
+        # its traceback, which already shows how far startup got
+        logger.info("✓ Startup complete (app, main loop, window); running main loop")
         main_loop.run()
         
         logger.info("Main loop exited")
@@ -2457,7 +3153,7 @@ if __name__ == '__main__':
         logger.info("Interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Fatal error in main: {e}", exc_info=True)
+        logger.error("Fatal error in main: %s", e, exc_info=True)
         try:
             dlg = Gtk.MessageDialog(flags=0, 
                                    message_type=Gtk.MessageType.ERROR,
@@ -2468,11 +3164,11 @@ if __name__ == '__main__':
             
             def on_response(dialog, response):
                 dialog.close()
-                GLib.MainLoop().quit()
+                main_loop.quit()
             
             dlg.connect("response", on_response)
             dlg.present()
-            GLib.MainLoop().run()
+            main_loop.run()
         except Exception as e2:
-             logger.error(f"Failed to even show error dialog: {e2}")
+             logger.error("Failed to even show error dialog: %s", e2)
         sys.exit(1)
\ No newline at end of file